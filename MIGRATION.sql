@@ -38,3 +38,55 @@ CREATE TABLE IF NOT EXISTS campus_notifications (
     expires_at TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
+
+-- 6. Create Student Academic Stats Table (subject_id = 0 holds overall totals)
+CREATE TABLE IF NOT EXISTS student_academic_stats (
+    student_id INTEGER REFERENCES students(id) ON DELETE CASCADE,
+    subject_id INTEGER NOT NULL DEFAULT 0,
+    attendance_present INTEGER NOT NULL DEFAULT 0,
+    attendance_total INTEGER NOT NULL DEFAULT 0,
+    marks_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    marks_count INTEGER NOT NULL DEFAULT 0,
+    lab_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    lab_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (student_id, subject_id)
+);
+-- Backfill afterwards with: python app/scripts/rebuild_academic_stats.py
+
+-- 7. Create Revoked Tokens Table (JWT ids revoked before expiry)
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti VARCHAR(64) PRIMARY KEY,
+    expires_at TIMESTAMP NOT NULL,
+    revoked_at TIMESTAMP DEFAULT (NOW() AT TIME ZONE 'utc')
+);
+CREATE INDEX IF NOT EXISTS idx_revoked_tokens_revoked_at ON revoked_tokens(revoked_at);
+CREATE INDEX IF NOT EXISTS idx_revoked_tokens_expires_at ON revoked_tokens(expires_at);
+
+-- 8. Keyset pagination index for the shared materials listing
+CREATE INDEX IF NOT EXISTS ix_shared_materials_created_at_id ON shared_materials(created_at, id);
+
+-- 9. Index for filtering expired campus notifications
+CREATE INDEX IF NOT EXISTS ix_campus_notifications_expires_at ON campus_notifications(expires_at);
+
+-- 10. Content-addressed storage for shared materials
+ALTER TABLE shared_materials ADD COLUMN IF NOT EXISTS file_name TEXT;
+ALTER TABLE shared_materials ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+ALTER TABLE shared_materials ADD COLUMN IF NOT EXISTS file_size BIGINT;
+CREATE INDEX IF NOT EXISTS ix_shared_materials_content_hash ON shared_materials(content_hash);
+
+-- 11. Track when each readiness score was last recomputed
+ALTER TABLE readiness_scores ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP;
+CREATE INDEX IF NOT EXISTS ix_student_academic_stats_updated_at ON student_academic_stats(updated_at);
+
+-- 12. Readiness history: trend index and compaction columns
+CREATE INDEX IF NOT EXISTS ix_readiness_history_student_recorded ON readiness_history(student_id, recorded_at);
+ALTER TABLE readiness_history ADD COLUMN IF NOT EXISTS granularity VARCHAR NOT NULL DEFAULT 'raw';
+ALTER TABLE readiness_history ADD COLUMN IF NOT EXISTS score_min FLOAT;
+ALTER TABLE readiness_history ADD COLUMN IF NOT EXISTS score_max FLOAT;
+ALTER TABLE readiness_history ADD COLUMN IF NOT EXISTS sample_count INTEGER NOT NULL DEFAULT 1;
+
+-- 13. Change marker for the shared materials listing ETag
+ALTER TABLE shared_materials ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP;
+UPDATE shared_materials SET updated_at = created_at WHERE updated_at IS NULL;
+CREATE INDEX IF NOT EXISTS ix_shared_materials_updated_at ON shared_materials(updated_at);
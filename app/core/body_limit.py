@@ -0,0 +1,57 @@
+from typing import Iterable
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+# Room for multipart boundaries and the small form fields sent with a file
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+class BodySizeLimitMiddleware:
+    """
+    Rejects oversized request bodies on the given path prefixes before they
+    are read. A Content-Length over the limit gets a 413 without touching the
+    body; chunked bodies are counted as they arrive and cut off with a 413 as
+    soon as they pass it, so nothing larger than the limit is ever spooled.
+    """
+
+    def __init__(self, app, max_bytes: int, paths: Iterable[str], methods: Iterable[str] = ("POST", "PUT", "PATCH")):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = tuple(paths)
+        self.methods = set(methods)
+
+    def _detail(self) -> str:
+        return f"Request body exceeds the {self.max_bytes // (1024 * 1024)} MB upload limit"
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in self.methods
+            or not scope["path"].startswith(self.paths)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    await JSONResponse({"detail": "Invalid Content-Length"}, status_code=400)(scope, receive, send)
+                    return
+                if declared > self.max_bytes:
+                    await JSONResponse({"detail": self._detail()}, status_code=413)(scope, receive, send)
+                    return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised while the route reads its body; FastAPI passes it through
+                    raise HTTPException(status_code=413, detail=self._detail())
+            return message
+
+        await self.app(scope, limited_receive, send)
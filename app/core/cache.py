@@ -0,0 +1,224 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+logger = logging.getLogger(__name__)
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache with per-entry expiry and LRU eviction.
+
+    Entries are popped only in the process that made the change. Other
+    worker processes keep serving theirs for up to ttl_seconds, which is
+    the staleness bound across workers.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Bumped by every pop() and clear(); see set()."""
+        return self._generation
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any, ttl_seconds: Optional[float] = None, generation: Optional[int] = None) -> None:
+        """
+        Store `value`. Pass the `generation` read before loading it to skip the
+        store if an invalidation happened in between, since the value may
+        predate it.
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generation += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+class DerivedCache:
+    """
+    Base for in-process values derived from database tables (indexes,
+    templates, feeds). Subclasses implement build(db).
+
+    - Builds are serialised and double-checked under a lock, so a burst of
+      requests on a cold cache runs one build, not one each.
+    - invalidate() bumps a generation counter. A build that was already
+      running when it arrived is installed as stale, so the invalidation is
+      never lost.
+    - An invalidated value is rebuilt before it is served again, so a
+      process reads its own committed writes. An expired value keeps being
+      served while one background thread rebuilds it. Subclasses that set
+      serve_stale_on_invalidate treat an invalidated value the same way, so
+      only the very first build runs on a request.
+
+    Invalidation reaches only this process. Other workers pick up changes
+    within ttl_seconds plus one rebuild.
+    """
+
+    serve_stale_on_invalidate = False
+
+    def __init__(self, name: str, ttl_seconds: float):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        # (value, generation it was built for, monotonic build time), swapped atomically
+        self._entry: Optional[Tuple[Any, int, float]] = None
+        self._generation = 0
+        self._refreshing = False
+        self._build_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+
+    def build(self, db: Session) -> Any:
+        raise NotImplementedError
+
+    def invalidate(self) -> None:
+        with self._state_lock:
+            self._generation += 1
+
+    def _is_fresh(self, entry: Optional[Tuple[Any, int, float]]) -> bool:
+        return (
+            entry is not None
+            and entry[1] == self._generation
+            and time.monotonic() - entry[2] < self.ttl_seconds
+        )
+
+    def rebuild(self, db: Session) -> Any:
+        """Build now, unless a build finished while this call waited for the lock."""
+        with self._build_lock:
+            entry = self._entry
+            if self._is_fresh(entry):
+                return entry[0]
+            generation = self._generation
+            value = self.build(db)
+            self._entry = (value, generation, time.monotonic())
+            return value
+
+    def peek(self) -> Any:
+        """
+        The current value without building inline: None when never built or
+        (unless serve_stale_on_invalidate) invalidated since. A value that is
+        served although expired or invalidated starts a background rebuild.
+        """
+        entry = self._entry
+        if entry is None:
+            return None
+        if entry[1] != self._generation:
+            if not self.serve_stale_on_invalidate:
+                return None
+            self._refresh_in_background()
+        elif time.monotonic() - entry[2] >= self.ttl_seconds:
+            self._refresh_in_background()
+        return entry[0]
+
+    def get(self, db: Session) -> Any:
+        """The current value; builds inline with `db` when peek() has none to serve."""
+        value = self.peek()
+        if value is None:
+            value = self.rebuild(db)
+        return value
+
+    def _refresh_in_background(self) -> None:
+        with self._state_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, name=f"{self.name}-refresh", daemon=True).start()
+
+    def _background_refresh(self) -> None:
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            self.rebuild(db)
+        except Exception as e:
+            logger.warning("Background rebuild of %s failed: %s", self.name, e)
+        finally:
+            db.close()
+            with self._state_lock:
+                self._refreshing = False
+
+_PENDING_INVALIDATIONS = "pending_cache_invalidations"
+_WHOLE_CACHE = object()
+
+def _invalidate(cache: Any, key: Any) -> None:
+    if key is _WHOLE_CACHE:
+        cache.invalidate()
+    else:
+        cache.pop(key)
+
+def invalidate_after_commit(session: Session, *caches: Any) -> None:
+    """
+    Invalidate `caches` when `session`'s transaction commits (dropped on
+    rollback). For writers that bypass the ORM hooks, such as Core or bulk
+    statements.
+    """
+    pending = session.info.setdefault(_PENDING_INVALIDATIONS, set())
+    pending.update((cache, _WHOLE_CACHE) for cache in caches)
+
+def invalidate_on_commit(
+    cache: Any,
+    *models: Any,
+    key: Optional[Callable[[Any], Any]] = None,
+    events: Tuple[str, ...] = ("after_insert", "after_update", "after_delete")
+) -> None:
+    """
+    Invalidate `cache` when a transaction that wrote one of `models` through
+    the ORM commits. Invalidating at flush time would let a concurrent reader
+    rebuild from the pre-commit rows and keep them as fresh. With `key`, only
+    the entry key(target) is popped from a keyed cache (TTLCache).
+
+    Core and bulk statements bypass these hooks; such writers must call
+    invalidate_after_commit() or rely on the TTL.
+    """
+    def _mark(mapper, connection, target):
+        entry = _WHOLE_CACHE if key is None else key(target)
+        session = object_session(target)
+        if session is None:
+            _invalidate(cache, entry)
+        else:
+            session.info.setdefault(_PENDING_INVALIDATIONS, set()).add((cache, entry))
+
+    for model in models:
+        for name in events:
+            event.listen(model, name, _mark)
+
+@event.listens_for(Session, "after_commit")
+def _run_pending_invalidations(session):
+    for cache, entry in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        _invalidate(cache, entry)
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_pending_invalidations(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_INVALIDATIONS, None)
@@ -11,10 +11,61 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "super_secret_key_change_in_production")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 1440))
+    # Authenticated principals are cached in-process per token for this long
+    TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", 60))
+    TOKEN_CACHE_MAX_SIZE: int = int(os.getenv("TOKEN_CACHE_MAX_SIZE", 10000))
+    # Password hashing runs on a dedicated process pool (0 = threadpool, no processes).
+    # Logins beyond workers + queue limit are rejected with 503 instead of queueing.
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_QUEUE_LIMIT: int = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", 32))
+    # Changing the cost makes existing hashes rehash transparently on next login
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    # How often each worker pulls new rows from revoked_tokens
+    REVOCATION_SYNC_SECONDS: int = int(os.getenv("REVOCATION_SYNC_SECONDS", 30))
+    # Accounts allowed to use staff endpoints (bulk ingest, exports, recomputes), as a JSON list
+    STAFF_EMAILS: list[str] = json.loads(os.getenv("STAFF_EMAILS", "[]"))
     
     # DATABASE
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
+    # Async mode: asyncpg for Postgres, aiosqlite for local SQLite runs.
+    # ASYNC_DATABASE_URL is derived from DATABASE_URL when left empty.
+    DB_ASYNC: bool = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
     
+    # CACHES
+    # In-memory resource recommendation index is rebuilt at least this often
+    RESOURCE_INDEX_TTL_SECONDS: int = int(os.getenv("RESOURCE_INDEX_TTL_SECONDS", 300))
+    # Precomputed roadmap templates are rebuilt at least this often
+    ROADMAP_CACHE_TTL_SECONDS: int = int(os.getenv("ROADMAP_CACHE_TTL_SECONDS", 300))
+    # Role -> skill bitset index used for role fit is rebuilt at least this often
+    ROLE_FIT_INDEX_TTL_SECONDS: int = int(os.getenv("ROLE_FIT_INDEX_TTL_SECONDS", 300))
+    # Active notification feed is reloaded at least this often
+    NOTIFICATION_CACHE_TTL_SECONDS: int = int(os.getenv("NOTIFICATION_CACHE_TTL_SECONDS", 30))
+    # Rendered dashboard summaries, per student
+    DASHBOARD_CACHE_TTL_SECONDS: int = int(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", 60))
+    DASHBOARD_CACHE_MAX_SIZE: int = int(os.getenv("DASHBOARD_CACHE_MAX_SIZE", 20000))
+    # Server-computed accreditation reports, per department/cohort and day
+    REPORT_CACHE_TTL_SECONDS: int = int(os.getenv("REPORT_CACHE_TTL_SECONDS", 3600))
+    REPORT_CACHE_MAX_SIZE: int = int(os.getenv("REPORT_CACHE_MAX_SIZE", 256))
+
+    # HISTORY
+    # Raw readiness snapshots older than this are compacted into daily buckets,
+    # daily buckets older than the second limit into weekly ones
+    READINESS_RAW_RETENTION_DAYS: int = int(os.getenv("READINESS_RAW_RETENTION_DAYS", 90))
+    READINESS_DAILY_RETENTION_DAYS: int = int(os.getenv("READINESS_DAILY_RETENTION_DAYS", 730))
+
+    # UPLOADS
+    MAX_UPLOAD_SIZE_MB: int = int(os.getenv("MAX_UPLOAD_SIZE_MB", 100))
+
+    # OBSERVABILITY
+    # Prometheus text metrics on /metrics (per worker process)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+    # Per-route query budgets and N+1 detection: "off", "warn" (log) or
+    # "strict" (fail the request; for tests and CI)
+    QUERY_BUDGET_MODE: str = os.getenv("QUERY_BUDGET_MODE", "warn").lower()
+    # The same statement shape this many times in one request is flagged as N+1
+    QUERY_REPEAT_THRESHOLD: int = int(os.getenv("QUERY_REPEAT_THRESHOLD", 10))
+
     # CORS
     BACKEND_CORS_ORIGINS: list[str] = json.loads(os.getenv("BACKEND_CORS_ORIGINS", '["*"]'))
 
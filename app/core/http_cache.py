@@ -0,0 +1,46 @@
+import hashlib
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+from fastapi import Request
+from fastapi.responses import FileResponse
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from the parts that determine a representation."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:20]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match already names this ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def not_modified(request: Request, etag: str, last_modified: Optional[float] = None) -> bool:
+    """
+    Conditional GET check. If-None-Match wins when present; otherwise
+    If-Modified-Since is compared against the resource's mtime.
+    """
+    if request.headers.get("if-none-match"):
+        return etag_matches(request, etag)
+    since = request.headers.get("if-modified-since")
+    if since and last_modified is not None:
+        try:
+            since_ts = parsedate_to_datetime(since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        return int(last_modified) <= since_ts
+    return False
+
+class LargeFileResponse(FileResponse):
+    """
+    FileResponse with larger read chunks. Starlette already answers Range and
+    If-Range requests with 206/416, and hands the path to the server for
+    zero-copy sendfile when it supports the ASGI pathsend extension.
+    """
+    chunk_size = 1024 * 1024
@@ -0,0 +1,265 @@
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Small in-process Prometheus registry; avoids a client library dependency.
+# Each worker process exposes its own numbers.
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.label_names, labels)} {value}" for labels, value in items
+        ]
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.label_names, labels)} {value}" for labels, value in items
+        ]
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (), buckets: Iterable[float] = ()):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> (per-bucket counts (last = +Inf), sum)
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float]] = {}
+
+    def observe(self, *labels: str, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(labels) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._values[labels] = (counts, total + value)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._values.items())
+        lines = self._header()
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                bucket_labels = _format_labels(self.label_names, labels, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+http_requests_total = Counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response is fully sent.",
+    ("method", "route"), LATENCY_BUCKETS
+)
+http_requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+db_queries_total = Counter("db_queries_total", "SQL statements executed, by route.", ("route",))
+db_query_seconds_total = Counter("db_query_seconds_total", "Time spent in SQL statements, by route.", ("route",))
+db_queries_per_request = Histogram(
+    "db_queries_per_request", "SQL statements executed per request.", ("route",), QUERY_COUNT_BUCKETS
+)
+db_pool_size = Gauge("db_pool_size", "Configured connection pool size.", ("pool",))
+db_pool_checked_out = Gauge("db_pool_checked_out", "Connections currently checked out of the pool.", ("pool",))
+db_pool_overflow = Gauge("db_pool_overflow", "Overflow connections in use beyond pool_size (negative while the pool is not full).", ("pool",))
+db_pool_checked_in = Gauge("db_pool_checked_in", "Idle connections held by the pool.", ("pool",))
+
+REGISTRY = [
+    http_requests_total, http_request_duration_seconds, http_requests_in_flight,
+    db_queries_total, db_query_seconds_total, db_queries_per_request,
+    db_pool_size, db_pool_checked_out, db_pool_overflow, db_pool_checked_in,
+]
+
+@dataclass
+class RequestStats:
+    """Per-request database counters, carried in a context variable."""
+    route: str = "unmatched"
+    queries: int = 0
+    db_seconds: float = 0.0
+    # Query budget tracking (see app.core.query_budget)
+    budget: Optional[int] = None
+    shapes: Dict[str, int] = field(default_factory=dict)
+    # Set once the response is sent; later statements (BackgroundTasks) are not the request's
+    completed: bool = False
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+# Called with the finished request's stats after its metrics are recorded
+request_finished_hooks: List[Callable[[RequestStats], None]] = []
+
+# Statements outside a request (scripts, background warmers) are labelled "background"
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_times"].pop()
+    elapsed = time.perf_counter() - started
+    stats = current_request.get()
+    if stats is not None and not stats.completed:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+    else:
+        db_queries_total.inc("background")
+        db_query_seconds_total.inc("background", amount=elapsed)
+
+@event.listens_for(Engine, "handle_error")
+def _discard_query_timer(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_times"):
+        conn.info["query_start_times"].pop()
+
+def _collect_pool_stats(pools: Dict[str, object]) -> None:
+    for label, pool in pools.items():
+        # Only QueuePool-style pools report sizes; skip the rest quietly
+        for gauge, method in (
+            (db_pool_size, "size"),
+            (db_pool_checked_out, "checkedout"),
+            (db_pool_overflow, "overflow"),
+            (db_pool_checked_in, "checkedin"),
+        ):
+            reader = getattr(pool, method, None)
+            if callable(reader):
+                gauge.set(label, value=reader())
+
+def render_metrics(pools: Dict[str, object]) -> str:
+    """Prometheus text exposition (format 0.0.4) of every registered metric."""
+    _collect_pool_stats(pools)
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+def route_template(scope) -> str:
+    """
+    The matched route's path template, e.g. /api/v1/students/{student_id}.
+    Routers that report the route without its include prefix fall back to
+    putting the path parameter names back into the concrete path.
+    """
+    route = scope.get("route")
+    if route is None and "endpoint" not in scope:
+        return "unmatched"
+    path = scope.get("path", "")
+    path_regex = getattr(route, "path_regex", None)
+    if path_regex is not None and path_regex.match(path):
+        return route.path
+    values = {str(value): name for name, value in scope.get("path_params", {}).items()}
+    return "/".join(
+        "{" + values[segment] + "}" if segment in values else segment
+        for segment in path.split("/")
+    )
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status and in-flight counts per route
+    template, plus the statements and DB time of each request. Latency covers
+    the whole response, including streamed bodies, and stops when the last
+    body chunk is sent: BackgroundTasks run after that and are not counted.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status = {"code": 500}
+        started = time.perf_counter()
+        finished = {"elapsed": None}
+
+        def finish():
+            if finished["elapsed"] is None:
+                finished["elapsed"] = time.perf_counter() - started
+                stats.completed = True
+                http_requests_in_flight.dec()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # No-op when the response completed; covers requests that never sent one
+            finish()
+            elapsed = finished["elapsed"]
+            current_request.reset(token)
+            # Route template (not the raw path) keeps label cardinality bounded
+            route = route_template(scope)
+            stats.route = route
+            method = scope.get("method", "")
+            http_requests_total.inc(method, route, str(status["code"]))
+            http_request_duration_seconds.observe(method, route, value=elapsed)
+            db_queries_total.inc(route, amount=stats.queries)
+            db_query_seconds_total.inc(route, amount=stats.db_seconds)
+            db_queries_per_request.observe(route, value=stats.queries)
+            for hook in request_finished_hooks:
+                hook(stats)
@@ -0,0 +1,97 @@
+import logging
+import re
+from typing import Optional
+from fastapi import Depends, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.core.metrics import (
+    REGISTRY, Counter, RequestStats, current_request, request_finished_hooks, route_template
+)
+
+logger = logging.getLogger(__name__)
+
+db_query_budget_exceeded_total = Counter(
+    "db_query_budget_exceeded_total", "Requests that ran more statements than their route's budget.", ("route",)
+)
+db_repeated_statements_total = Counter(
+    "db_repeated_statements_total", "Requests on budgeted routes with a statement shape repeated past the N+1 threshold.", ("route",)
+)
+REGISTRY.extend([db_query_budget_exceeded_total, db_repeated_statements_total])
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised in strict mode when a request breaks its route's query budget."""
+
+async def query_budget_exceeded_handler(request: Request, exc: QueryBudgetExceeded) -> JSONResponse:
+    """Strict-mode failures are answered deliberately and logged, not left as unhandled errors."""
+    logger.error("Query budget enforcement failed %s %s: %s", request.method, request.url.path, exc)
+    return JSONResponse(status_code=500, content={"detail": "Query budget exceeded", "error": str(exc)})
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanded IN lists and multi-row VALUES differ only in how many placeholders they carry
+_IN_LIST = re.compile(r"\bIN \([^()]*\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"\bVALUES\s*\([^()]*\)(\s*,\s*\([^()]*\))*", re.IGNORECASE)
+
+def statement_shape(statement: str) -> str:
+    """Normalise a SQL statement so repeats of the same query compare equal."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _IN_LIST.sub("IN (...)", shape)
+    return _VALUES_ROWS.sub("VALUES (...)", shape)
+
+def query_budget(max_queries: int):
+    """
+    Declare a route's statement budget:
+
+        @router.get("/{student_id}", dependencies=[query_budget(1)])
+
+    Only routes that declare a budget are checked, for both the budget and
+    repeated statements (N+1), in warn and strict mode alike: routes that
+    batch by design (e.g. ingest) stay unbudgeted. In strict mode breaking
+    either check fails the request; in warn mode it is logged and counted.
+    """
+    async def _declare_budget(request: Request) -> None:
+        stats = current_request.get()
+        if stats is not None:
+            stats.budget = max_queries
+            stats.route = route_template(request.scope)
+    return Depends(_declare_budget)
+
+def _repeated_shape(stats: RequestStats) -> Optional[tuple]:
+    if not stats.shapes:
+        return None
+    shape, count = max(stats.shapes.items(), key=lambda item: item[1])
+    return (shape, count) if count >= settings.QUERY_REPEAT_THRESHOLD else None
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _enforce_budget(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+    if stats is None or stats.completed or stats.budget is None or settings.QUERY_BUDGET_MODE == "off":
+        return
+    shape = statement_shape(statement)
+    stats.shapes[shape] = stats.shapes.get(shape, 0) + 1
+
+    if settings.QUERY_BUDGET_MODE != "strict":
+        return
+    # Fail at the offending statement so the traceback points at the caller
+    if stats.queries > stats.budget:
+        raise QueryBudgetExceeded(
+            f"{stats.route} ran {stats.queries} statements, budget is {stats.budget}: {shape[:200]}"
+        )
+    if stats.shapes[shape] >= settings.QUERY_REPEAT_THRESHOLD:
+        raise QueryBudgetExceeded(
+            f"{stats.route} repeated one statement {stats.shapes[shape]} times (N+1): {shape[:200]}"
+        )
+
+def _report_request(stats: RequestStats) -> None:
+    if settings.QUERY_BUDGET_MODE == "off" or stats.budget is None:
+        return
+    if stats.queries > stats.budget:
+        db_query_budget_exceeded_total.inc(stats.route)
+        logger.warning("Query budget exceeded on %s: %d statements, budget %d", stats.route, stats.queries, stats.budget)
+    repeated = _repeated_shape(stats)
+    if repeated is not None:
+        db_repeated_statements_total.inc(stats.route)
+        logger.warning("Possible N+1 on %s: statement repeated %d times: %s", stats.route, repeated[1], repeated[0][:200])
+
+request_finished_hooks.append(_report_request)
@@ -1,10 +1,25 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.cache import TTLCache
 
-pwd_context = CryptContext(schemes=["bcrypt", "pbkdf2_sha256"], deprecated="auto")
+# Pinning min/max rounds to BCRYPT_ROUNDS makes needs_update() flag hashes
+# made with any other cost, as well as the deprecated pbkdf2_sha256 ones.
+pwd_context = CryptContext(
+    schemes=["bcrypt", "pbkdf2_sha256"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -12,12 +27,139 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
-def create_access_token(subject: Union[str, int], expires_delta: Optional[timedelta] = None) -> str:
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Return (matches, new_hash); new_hash is set when the stored hash needs an upgrade."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+class PasswordPoolSaturated(Exception):
+    """Raised when the password hashing pool has no free slot."""
+
+_hash_pool: Optional[Executor] = None
+_hash_pool_lock = threading.Lock()
+_hash_slots = threading.BoundedSemaphore(
+    max(1, settings.PASSWORD_HASH_WORKERS) + settings.PASSWORD_HASH_QUEUE_LIMIT
+)
+
+def _get_hash_pool() -> Executor:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            if settings.PASSWORD_HASH_WORKERS > 0:
+                _hash_pool = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                # No worker processes (e.g. local debugging): one dedicated thread
+                _hash_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="password-hash")
+        return _hash_pool
+
+def _discard_hash_pool(pool: Executor) -> None:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is pool:
+            _hash_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=False, cancel_futures=True)
+            _hash_pool = None
+
+async def _run_in_hash_pool(fn: Callable, *args) -> Any:
+    # Fail fast instead of letting a login burst queue up behind bcrypt.
+    # The slot is released when the job finishes, even if the caller gave up.
+    if not _hash_slots.acquire(blocking=False):
+        raise PasswordPoolSaturated()
+    try:
+        pool = _get_hash_pool()
+        future = pool.submit(fn, *args)
+    except BaseException:
+        _hash_slots.release()
+        raise
+    future.add_done_callback(lambda _: _hash_slots.release())
+    try:
+        return await asyncio.wrap_future(future)
+    except BrokenExecutor as e:
+        # A worker died (e.g. OOM-killed); start a fresh pool for the next call
+        _discard_hash_pool(pool)
+        raise PasswordPoolSaturated() from e
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """verify_and_update_password on the bounded hashing pool; may raise PasswordPoolSaturated."""
+    return await _run_in_hash_pool(verify_and_update_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the bounded hashing pool; may raise PasswordPoolSaturated."""
+    return await _run_in_hash_pool(get_password_hash, password)
+
+def create_access_token(
+    subject: Union[str, int],
+    expires_delta: Optional[timedelta] = None,
+    claims: Optional[Dict[str, Any]] = None
+) -> str:
+    now = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    # jti identifies the token for revocation; extra claims let callers
+    # resolve the student without a database lookup
+    to_encode = {"exp": expire, "iat": now, "sub": str(subject), "jti": uuid.uuid4().hex}
+    if claims:
+        to_encode.update(claims)
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """Verify signature and expiry; raises jose.JWTError on failure."""
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+class RevokedTokenSet:
+    """
+    In-memory set of revoked token ids (jti). Entries are dropped once the
+    token would have expired anyway, so the set only holds live revocations.
+    The revoked_tokens table is the shared source of truth; sync() pulls new
+    rows from it at most every REVOCATION_SYNC_SECONDS.
+    """
+
+    def __init__(self, sync_interval_seconds: float):
+        self.sync_interval_seconds = sync_interval_seconds
+        self._expiry: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._last_sync = 0.0
+        self.synced_until: Optional[datetime] = None
+
+    def __contains__(self, jti: Optional[str]) -> bool:
+        if jti is None:
+            return False
+        with self._lock:
+            expires_at = self._expiry.get(jti)
+            if expires_at is None:
+                return False
+            if expires_at <= datetime.utcnow():
+                del self._expiry[jti]
+                return False
+            return True
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        with self._lock:
+            self._expiry[jti] = expires_at
+
+    def needs_sync(self) -> bool:
+        return time.monotonic() - self._last_sync >= self.sync_interval_seconds
+
+    def mark_synced(self, synced_until: Optional[datetime]) -> None:
+        now = datetime.utcnow()
+        with self._lock:
+            self._last_sync = time.monotonic()
+            if synced_until is not None:
+                self.synced_until = synced_until
+            for jti in [jti for jti, exp in self._expiry.items() if exp <= now]:
+                del self._expiry[jti]
+
+principal_cache = TTLCache(settings.TOKEN_CACHE_TTL_SECONDS, settings.TOKEN_CACHE_MAX_SIZE)
+revoked_tokens = RevokedTokenSet(settings.REVOCATION_SYNC_SECONDS)
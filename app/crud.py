@@ -1,6 +1,8 @@
+from datetime import datetime
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.core.security import get_password_hash
+from app.services.academic_stats import bump_academic_stats
 
 def get_student(db: Session, student_id: int):
     return db.query(models.Student).filter(models.Student.id == student_id).first()
@@ -8,8 +10,13 @@ def get_student(db: Session, student_id: int):
 def get_student_by_email(db: Session, email: str):
     return db.query(models.Student).filter(models.Student.email == email).first()
 
-def create_student(db: Session, student: schemas.StudentCreate):
-    hashed_password = get_password_hash(student.password)
+def get_student_by_roll_number(db: Session, roll_number: str):
+    return db.query(models.Student).filter(models.Student.roll_number == roll_number).first()
+
+def create_student(db: Session, student: schemas.StudentCreate, hashed_password: str = None):
+    # Callers on the request path pass a hash computed on the hashing pool
+    if hashed_password is None:
+        hashed_password = get_password_hash(student.password)
     db_student = models.Student(
         name=student.name, 
         roll_number=student.roll_number,
@@ -21,6 +28,12 @@ def create_student(db: Session, student: schemas.StudentCreate):
     db.refresh(db_student)
     return db_student
 
+def update_password_hash(db: Session, student_id: int, hashed_password: str):
+    db.query(models.Student).filter(models.Student.id == student_id).update(
+        {models.Student.hashed_password: hashed_password}, synchronize_session=False
+    )
+    db.commit()
+
 def get_subjects(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Subject).offset(skip).limit(limit).all()
 
@@ -32,8 +45,13 @@ def create_subject(db: Session, subject: schemas.SubjectCreate):
     return db_subject
 
 def create_attendance(db: Session, attendance: schemas.AttendanceCreate):
-    db_attendance = models.AttendanceRecord(**attendance.model_dump())
+    db_attendance = models.AttendanceRecord(**attendance.model_dump(exclude_none=True))
     db.add(db_attendance)
+    bump_academic_stats(
+        db, attendance.student_id, attendance.subject_id,
+        attendance_present=1 if attendance.status else 0,
+        attendance_total=1
+    )
     db.commit()
     db.refresh(db_attendance)
     return db_attendance
@@ -41,12 +59,39 @@ def create_attendance(db: Session, attendance: schemas.AttendanceCreate):
 def create_mark(db: Session, mark: schemas.MarkCreate):
     db_mark = models.Mark(**mark.model_dump())
     db.add(db_mark)
+    bump_academic_stats(db, mark.student_id, mark.subject_id, marks_sum=mark.score, marks_count=1)
     db.commit()
     db.refresh(db_mark)
     return db_mark
 
+def create_lab_performance(db: Session, lab: schemas.LabPerformanceCreate):
+    db_lab = models.LabPerformance(**lab.model_dump())
+    db.add(db_lab)
+    bump_academic_stats(db, lab.student_id, lab.subject_id, lab_sum=lab.score, lab_count=1)
+    db.commit()
+    db.refresh(db_lab)
+    return db_lab
+
+def create_shared_material(db: Session, material: schemas.SharedMaterialCreate):
+    db_material = models.SharedMaterial(**material.model_dump())
+    db.add(db_material)
+    db.commit()
+    db.refresh(db_material)
+    return db_material
+
 def get_readiness_score(db: Session, student_id: int):
     return db.query(models.ReadinessScore).filter(models.ReadinessScore.student_id == student_id).first()
 
 def get_placement_prediction(db: Session, student_id: int):
     return db.query(models.PlacementPrediction).filter(models.PlacementPrediction.student_id == student_id).first()
+
+def revoke_token(db: Session, jti: str, expires_at: datetime):
+    if db.get(models.RevokedToken, jti) is None:
+        db.add(models.RevokedToken(jti=jti, expires_at=expires_at))
+        db.commit()
+
+def get_revoked_tokens_since(db: Session, since: datetime = None):
+    query = db.query(models.RevokedToken).filter(models.RevokedToken.expires_at > datetime.utcnow())
+    if since is not None:
+        query = query.filter(models.RevokedToken.revoked_at >= since)
+    return query.all()
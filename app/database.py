@@ -1,7 +1,11 @@
+from typing import Any, Callable, TypeVar
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
 
+T = TypeVar("T")
+
 # Supabase requires special connection arguments depending on if it's Serverless/Pooler or not.
 # pool_pre_ping=True helps with persistent connections to Supabase.
 connect_args = {}
@@ -27,3 +31,70 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto the matching async driver."""
+    for prefix in ("postgresql+psycopg2://", "postgresql+psycopg://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+# Optional async stack, only built when DB_ASYNC is enabled so the async
+# drivers are not required otherwise.
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DB_ASYNC:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_url = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+    async_connect_args = {}
+    if async_url.startswith("postgresql+asyncpg://"):
+        if "supabase.co" in async_url:
+            async_connect_args["ssl"] = "require"
+        # The Supabase pooler (pgbouncer, port 6543) cannot keep prepared statements
+        if "pooler" in async_url or ":6543" in async_url:
+            async_connect_args["statement_cache_size"] = 0
+
+    pool_args = {}
+    if not async_url.startswith("sqlite"):
+        pool_args = {"pool_size": 10, "max_overflow": 20}
+
+    async_engine = create_async_engine(
+        async_url,
+        connect_args=async_connect_args,
+        pool_pre_ping=True,
+        **pool_args
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+# Dependency for async endpoints: an AsyncSession in async mode,
+# otherwise the regular sync Session.
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+        return
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def run_db(db: Any, fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run sync crud/service code against whatever get_async_db provided.
+    With an AsyncSession it runs on the event loop through run_sync, so no
+    threadpool slot is held while waiting on the database; with a sync
+    Session it is pushed to the threadpool as before.
+    """
+    if isinstance(db, Session):
+        return await run_in_threadpool(fn, db, *args, **kwargs)
+    return await db.run_sync(fn, *args, **kwargs)
@@ -1,10 +1,22 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.routers import auth, students, predictions, collaboration
-from app.database import engine, get_db
+from app.core.security import shutdown_hash_pool
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.body_limit import BodySizeLimitMiddleware, FORM_OVERHEAD_BYTES
+from app.core.query_budget import QueryBudgetExceeded, query_budget_exceeded_handler
+from app.routers import auth, students, predictions, collaboration, ingest, exports
+from app import database
+from app.database import engine, get_db, SessionLocal
+from app.services.recommendation import resource_index
+from app.services.roadmap import roadmap_cache
+from app.services.role_fit import role_skill_index
 from app import models
 
 # Avoid creating tables here automatically if making schema files to run via Supabase SQL Editor manually, 
@@ -12,9 +24,43 @@ from app import models
 # Step 2 instructions mention we will paste SQL inside Supabase SQL editor.
 # models.Base.metadata.create_all(bind=engine)
 
+logger = logging.getLogger(__name__)
+
+def warm_caches():
+    """Build in-memory indexes so the first requests do not have to."""
+    db = SessionLocal()
+    try:
+        # Each cache on its own: one failing build must not leave the others cold
+        for cache in (resource_index, roadmap_cache, role_skill_index):
+            try:
+                cache.rebuild(db)
+            except Exception:
+                db.rollback()
+                logger.exception("Could not warm %s; it will be built on first use", cache.name)
+    finally:
+        db.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm in the background so startup does not wait on the database
+    asyncio.get_running_loop().run_in_executor(None, warm_caches)
+    yield
+    shutdown_hash_pool()
+    if database.async_engine is not None:
+        await database.async_engine.dispose()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
+    lifespan=lifespan,
+)
+
+# Refuse oversized uploads before Starlette spools the multipart body; added
+# before CORS so the 413 still carries CORS headers
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024 + FORM_OVERHEAD_BYTES,
+    paths=["/api/v1/collaboration/materials"],
 )
 
 # Simplified, ultra-permissive CORS for debugging
@@ -24,12 +70,31 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "Content-Disposition"],
 )
 
+if settings.METRICS_ENABLED or settings.QUERY_BUDGET_MODE != "off":
+    # Added last so it wraps CORS and sees every request; also carries the
+    # per-request stats that query budgets are checked against
+    app.add_middleware(MetricsMiddleware)
+
+app.add_exception_handler(QueryBudgetExceeded, query_budget_exceeded_handler)
+
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(students.router, prefix="/api/v1/students", tags=["students"])
 app.include_router(predictions.router, prefix="/api/v1/predictions", tags=["predictions"])
 app.include_router(collaboration.router, prefix="/api/v1/collaboration", tags=["collaboration"])
+app.include_router(ingest.router, prefix="/api/v1/ingest", tags=["ingest"])
+app.include_router(exports.router, prefix="/api/v1/exports", tags=["exports"])
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse("Metrics disabled\n", status_code=404)
+    pools = {"sync": engine.pool}
+    if database.async_engine is not None:
+        pools["async"] = database.async_engine.sync_engine.pool
+    return PlainTextResponse(render_metrics(pools), media_type="text/plain; version=0.0.4")
 
 @app.get("/")
 def root():
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, BigInteger, String, Float, ForeignKey, DateTime, Boolean, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -101,6 +101,7 @@ class ReadinessScore(Base):
     risk_level = Column(String) # Low, Medium, High
     missing_skills = Column(Text) # Comma separated or JSON
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=True) # Inputs snapshot time of the last recomputation
 
     student = relationship("Student", back_populates="readiness_score")
 
@@ -117,12 +118,25 @@ class PlacementPrediction(Base):
     student = relationship("Student", back_populates="placement_prediction")
 
 class ReadinessHistory(Base):
+    """
+    Readiness snapshots. Raw rows hold one recomputation each; compaction
+    rolls old raw rows into "day" and later "week" rows where score is the
+    bucket average and recorded_at the bucket start.
+    """
     __tablename__ = "readiness_history"
+    __table_args__ = (
+        # Trend queries: one student (or an IN list) over a time range
+        Index("ix_readiness_history_student_recorded", "student_id", "recorded_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"))
     score = Column(Float)
     recorded_at = Column(DateTime, default=datetime.utcnow)
+    granularity = Column(String, default="raw", nullable=False) # raw, day, week
+    score_min = Column(Float, nullable=True) # NULL on raw rows (= score)
+    score_max = Column(Float, nullable=True)
+    sample_count = Column(Integer, default=1, nullable=False)
 
 class Badge(Base):
     __tablename__ = "badges"
@@ -157,13 +171,23 @@ class SharedMaterial(Base):
     description = Column(Text, nullable=True)
     category = Column(String) # Notes, Lab, Assignments, PrevPapers
     file_path = Column(String) # Path to local storage or URL
+    file_name = Column(String, nullable=True) # Original upload filename
+    content_hash = Column(String(64), nullable=True, index=True) # SHA-256; identical files share file_path
+    file_size = Column(BigInteger, nullable=True)
     subject_id = Column(Integer, ForeignKey("subjects.id"))
     uploader_id = Column(Integer, ForeignKey("students.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped on every write; max(updated_at) is the listing's ETag validator
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     subject = relationship("Subject")
     uploader = relationship("Student", back_populates="shared_materials")
 
+    __table_args__ = (
+        # Keyset pagination order for the materials listing
+        Index("ix_shared_materials_created_at_id", "created_at", "id"),
+    )
+
 class CampusNotification(Base):
     __tablename__ = "campus_notifications"
 
@@ -172,5 +196,30 @@ class CampusNotification(Base):
     content = Column(Text)
     priority = Column(String, default="Normal") # Low, Normal, High, Urgent
     category = Column(String) # Academic, Event, Placement, General
-    expires_at = Column(DateTime, nullable=True)
+    expires_at = Column(DateTime, nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+class StudentAcademicStats(Base):
+    """
+    Running attendance/marks/lab totals per student and subject, maintained by
+    crud on every insert. The row with subject_id == 0 holds the student's
+    overall totals across all subjects.
+    """
+    __tablename__ = "student_academic_stats"
+
+    student_id = Column(Integer, ForeignKey("students.id"), primary_key=True)
+    subject_id = Column(Integer, primary_key=True, default=0) # 0 = overall
+    attendance_present = Column(Integer, default=0)
+    attendance_total = Column(Integer, default=0)
+    marks_sum = Column(Float, default=0.0)
+    marks_count = Column(Integer, default=0)
+    lab_sum = Column(Float, default=0.0)
+    lab_count = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String, primary_key=True)
+    expires_at = Column(DateTime, index=True)
+    revoked_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -1,61 +1,142 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from jose import jwt, JWTError
-from datetime import timedelta
+from jose import JWTError
+import time
+from datetime import datetime, timedelta
 
 from app import schemas, crud, models
-from app.database import get_db
-from app.core.security import verify_password, create_access_token
+from app.database import get_db, get_async_db, run_db
+from app.core.security import (
+    create_access_token, decode_access_token, principal_cache, revoked_tokens,
+    verify_and_update_password_async, get_password_hash_async, PasswordPoolSaturated
+)
 from app.core.config import settings
 
 router = APIRouter()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Revocations made by other workers become visible after at most this lag
+REVOCATION_SYNC_OVERLAP = timedelta(seconds=60)
+
+def student_token_claims(student: models.Student) -> dict:
+    """Profile claims embedded in access tokens so requests can skip the DB lookup."""
+    return {
+        "sid": student.id,
+        "name": student.name,
+        "roll": student.roll_number,
+        "year": student.current_year,
+        "created": student.created_at.isoformat() if student.created_at else None,
+    }
+
+def sync_revoked_tokens(db: Session):
+    since = revoked_tokens.synced_until - REVOCATION_SYNC_OVERLAP if revoked_tokens.synced_until else None
+    latest = revoked_tokens.synced_until
+    for row in crud.get_revoked_tokens_since(db, since=since):
+        revoked_tokens.add(row.jti, row.expires_at)
+        if row.revoked_at and (latest is None or row.revoked_at > latest):
+            latest = row.revoked_at
+    revoked_tokens.mark_synced(latest)
+
 @router.get("/me", response_model=schemas.StudentOut)
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    """Return the profile of the currently logged-in student from their JWT."""
+    """
+    Return the profile of the currently logged-in student from their JWT.
+    Tokens carrying profile claims resolve without touching the students table;
+    older tokens fall back to a lookup by email. Either way the principal is
+    cached per token for TOKEN_CACHE_TTL_SECONDS.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    if revoked_tokens.needs_sync():
+        sync_revoked_tokens(db)
+
+    cached = principal_cache.get(token)
+    if cached is not None:
+        jti, principal = cached
+        if jti in revoked_tokens:
+            principal_cache.pop(token)
+            raise credentials_exception
+        return principal
+
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode_access_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
-    student = crud.get_student_by_email(db, email=email)
-    if student is None:
+    jti = payload.get("jti")
+    if jti in revoked_tokens:
         raise credentials_exception
-    return student
+
+    if payload.get("sid") is not None:
+        principal = schemas.StudentOut(
+            id=payload["sid"],
+            name=payload.get("name"),
+            roll_number=payload.get("roll"),
+            email=email,
+            current_year=payload.get("year"),
+            created_at=payload.get("created"),
+        )
+    else:
+        student = crud.get_student_by_email(db, email=email)
+        if student is None:
+            raise credentials_exception
+        principal = schemas.StudentOut.model_validate(student)
+
+    remaining = payload["exp"] - time.time() if "exp" in payload else None
+    principal_cache.set(token, (jti, principal), ttl_seconds=remaining)
+    return principal
+
+def get_current_staff(current_user: schemas.StudentOut = Depends(get_current_user)) -> schemas.StudentOut:
+    """Authenticated principal listed in STAFF_EMAILS; 403 for everyone else."""
+    staff = {email.lower() for email in settings.STAFF_EMAILS}
+    if (current_user.email or "").lower() not in staff:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Staff access required",
+        )
+    return current_user
+
+def password_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is busy, please retry shortly.",
+        headers={"Retry-After": "1"},
+    )
 
 @router.post("/register", response_model=schemas.StudentOut, status_code=status.HTTP_201_CREATED)
-def register_student(student: schemas.StudentCreate, db: Session = Depends(get_db)):
+async def register_student(student: schemas.StudentCreate, db=Depends(get_async_db)):
     """Register a new student account."""
     # Check if email already exists
-    if crud.get_student_by_email(db, email=student.email):
+    if await run_db(db, crud.get_student_by_email, email=student.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="An account with this email already exists.",
         )
     # Check if roll number already exists
-    existing_roll = db.query(models.Student).filter(models.Student.roll_number == student.roll_number).first()
+    existing_roll = await run_db(db, crud.get_student_by_roll_number, roll_number=student.roll_number)
     if existing_roll:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="An account with this roll number already exists.",
         )
-    return crud.create_student(db=db, student=student)
+    try:
+        hashed_password = await get_password_hash_async(student.password)
+    except PasswordPoolSaturated:
+        raise password_pool_busy()
+    return await run_db(db, crud.create_student, student=student, hashed_password=hashed_password)
 
 @router.post("/login", response_model=schemas.Token)
-def login_for_access_token(db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()):
+async def login_for_access_token(db=Depends(get_async_db), form_data: OAuth2PasswordRequestForm = Depends()):
     print(f"DEBUG: Login attempt for email: '{form_data.username}'")
-    user = crud.get_student_by_email(db, email=form_data.username)
+    user = await run_db(db, crud.get_student_by_email, email=form_data.username)
     if not user:
         print(f"DEBUG: User not found in database: '{form_data.username}'")
         raise HTTPException(
@@ -64,7 +145,11 @@ def login_for_access_token(db: Session = Depends(get_db), form_data: OAuth2Passw
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    match = verify_password(form_data.password, user.hashed_password)
+    # bcrypt runs on the bounded hashing pool, off the event loop and threadpool
+    try:
+        match, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+    except PasswordPoolSaturated:
+        raise password_pool_busy()
     print(f"DEBUG: Password match for {user.email}: {match}")
     
     if not match:
@@ -74,13 +159,37 @@ def login_for_access_token(db: Session = Depends(get_db), form_data: OAuth2Passw
             detail=f"Authentication failed: Incorrect password for {form_data.username}",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    if new_hash:
+        # Stored hash uses an old scheme or cost; upgrade it transparently
+        await run_db(db, crud.update_password_hash, student_id=user.id, hashed_password=new_hash)
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        subject=user.email, expires_delta=access_token_expires
+        subject=user.email,
+        expires_delta=access_token_expires,
+        claims=student_token_claims(user)
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    """Revoke the presented token so it is rejected before it expires."""
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    jti = payload.get("jti")
+    if jti is not None:
+        expires_at = datetime.utcfromtimestamp(payload["exp"])
+        crud.revoke_token(db, jti, expires_at)
+        revoked_tokens.add(jti, expires_at)
+    principal_cache.pop(token)
+
 @router.get("/debug-students")
 def debug_students(db: Session = Depends(get_db)):
     students = db.query(models.Student).all()
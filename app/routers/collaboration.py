@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request, Response
+from sqlalchemy import func, tuple_
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import base64
+import mimetypes
 import os
-import shutil
 from datetime import datetime
+from email.utils import formatdate
 
-from app import models, schemas
-from app.database import get_db
+from app import models, schemas, crud
+from app.database import get_db, get_async_db, run_db
+from app.core.config import settings
 from app.routers.auth import get_current_user
+from app.core.http_cache import make_etag, etag_matches, not_modified, LargeFileResponse
+from app.core.query_budget import query_budget
+from app.services.notifications import notification_feed
+from app.services.storage import store_upload, UploadTooLarge
 
 router = APIRouter()
 
@@ -22,58 +29,136 @@ async def upload_material(
     subject_id: int = Form(...),
     description: Optional[str] = Form(None),
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user: models.Student = Depends(get_current_user)
+    db=Depends(get_async_db),
+    current_user: schemas.StudentOut = Depends(get_current_user)
 ):
-    # Save file to local storage
-    file_path = os.path.join(UPLOAD_DIR, f"{datetime.utcnow().timestamp()}_{file.filename}")
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Stream to content-addressed local storage; identical files are stored once
+    try:
+        stored = await store_upload(file, UPLOAD_DIR, settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024)
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File exceeds the {settings.MAX_UPLOAD_SIZE_MB} MB upload limit"
+        )
 
-    db_material = models.SharedMaterial(
+    material = schemas.SharedMaterialCreate(
         title=title,
         description=description,
         category=category,
-        file_path=file_path,
         subject_id=subject_id,
+        file_path=stored.path,
+        file_name=file.filename,
+        content_hash=stored.sha256,
+        file_size=stored.size,
         uploader_id=current_user.id
     )
-    db.add(db_material)
-    db.commit()
-    db.refresh(db_material)
-    return db_material
+    return await run_db(db, crud.create_shared_material, material)
+
+def encode_cursor(created_at: datetime, material_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{material_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, material_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(material_id)
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-@router.get("/materials", response_model=List[schemas.SharedMaterialOut])
+@router.get("/materials", response_model=List[schemas.SharedMaterialOut], dependencies=[query_budget(2)])
 def get_materials(
+    request: Request,
+    response: Response,
     category: Optional[str] = None,
     subject_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
     db: Session = Depends(get_db)
 ):
+    """
+    Newest-first listing, paged by keyset on (created_at, id).
+    Pass the X-Next-Cursor response header back as `cursor` for the next page.
+    """
     query = db.query(models.SharedMaterial)
     if category:
         query = query.filter(models.SharedMaterial.category == category)
     if subject_id:
         query = query.filter(models.SharedMaterial.subject_id == subject_id)
-    return query.order_by(models.SharedMaterial.created_at.desc()).all()
+
+    # Validator over the whole table rather than the filtered set: both maxima
+    # are single index lookups, and a write anywhere only costs a refetch.
+    # New rows raise max(id) and edits raise max(updated_at); materials are
+    # never deleted through the API.
+    last_updated, newest_id = db.query(
+        func.max(models.SharedMaterial.updated_at),
+        func.max(models.SharedMaterial.id)
+    ).one()
+    etag = make_etag("materials", last_updated, newest_id, category, subject_id, cursor, limit)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    if cursor:
+        cursor_created, cursor_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(models.SharedMaterial.created_at, models.SharedMaterial.id) < tuple_(cursor_created, cursor_id)
+        )
+    materials = (
+        query.order_by(models.SharedMaterial.created_at.desc(), models.SharedMaterial.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    response.headers["ETag"] = etag
+    if len(materials) > limit:
+        materials = materials[:limit]
+        last = materials[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+    return materials
 
 @router.get("/materials/{material_id}/download")
-def download_material(material_id: int, db: Session = Depends(get_db)):
+def download_material(material_id: int, request: Request, db: Session = Depends(get_db)):
     material = db.query(models.SharedMaterial).filter(models.SharedMaterial.id == material_id).first()
     if not material:
         raise HTTPException(status_code=404, detail="Material not found")
     
-    if not os.path.exists(material.file_path):
+    try:
+        stat_result = os.stat(material.file_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found on server")
-        
-    return FileResponse(
+
+    filename = material.file_name or os.path.basename(material.file_path).split('_', 1)[-1]
+    if material.content_hash:
+        # Content-addressed: the hash is a stable validator across restarts and dedup
+        etag = f'"{material.content_hash}"'
+        cache_control = "public, max-age=86400"
+    else:
+        etag = make_etag("file", stat_result.st_mtime, stat_result.st_size)
+        cache_control = "no-cache"
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Cache-Control": cache_control,
+    }
+    if not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    # Handles Range/If-Range (206/416) and uses sendfile when the server supports it
+    return LargeFileResponse(
         path=material.file_path,
-        filename=os.path.basename(material.file_path).split('_', 1)[-1],
-        media_type='application/octet-stream'
+        filename=filename,
+        media_type=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+        headers=headers,
+        stat_result=stat_result
     )
 
-@router.get("/notifications", response_model=List[schemas.CampusNotificationOut])
-def get_notifications(db: Session = Depends(get_db)):
-    return db.query(models.CampusNotification).order_by(models.CampusNotification.created_at.desc()).all()
+@router.get("/notifications", response_model=List[schemas.CampusNotificationOut], dependencies=[query_budget(1)])
+def get_notifications(since: Optional[int] = None, db: Session = Depends(get_db)):
+    """
+    Active (non-expired) notifications, newest first, served from memory.
+    Pass the highest id already seen as `since` to fetch only newer ones.
+    """
+    return notification_feed.active(db, since=since)
 
 @router.post("/notifications", response_model=schemas.CampusNotificationOut)
 def create_notification(
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+
+from app import schemas
+from app.routers.auth import get_current_staff
+from app.services.export import iter_cohort_rows, stream_csv, stream_ndjson, EXPORT_BATCH_SIZE
+
+router = APIRouter()
+
+EXPORT_FORMATS = {
+    "csv": (stream_csv, "text/csv"),
+    "ndjson": (stream_ndjson, "application/x-ndjson"),
+}
+
+@router.get("/cohort")
+def export_cohort(
+    format: str = "csv",
+    current_year: Optional[int] = None,
+    batch_size: int = Query(EXPORT_BATCH_SIZE, ge=100, le=10000),
+    current_user: schemas.StudentOut = Depends(get_current_staff)
+):
+    """
+    Stream per-student analytics (profile, attendance %, marks and lab
+    averages, readiness, placement probability) as CSV or NDJSON. Rows are
+    read through a server-side cursor and sent batch by batch, so the
+    download starts immediately and memory stays flat for any cohort size.
+    Staff only: the export carries every student's contact details.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="format must be 'csv' or 'ndjson'")
+    encoder, media_type = EXPORT_FORMATS[format]
+    scope = f"year{current_year}" if current_year is not None else "all"
+    rows = iter_cohort_rows(current_year=current_year, batch_size=batch_size)
+    # Sync generator: Starlette iterates it in the threadpool
+    return StreamingResponse(
+        encoder(rows, chunk_rows=batch_size),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="cohort-{scope}.{format}"'}
+    )
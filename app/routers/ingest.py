@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import Optional
+
+from app import schemas
+from app.database import get_async_db
+from app.routers.auth import get_current_staff
+from app.services.ingest import ingest_stream, DEFAULT_BATCH_SIZE
+
+router = APIRouter()
+
+CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+def resolve_format(request: Request, format: Optional[str]) -> str:
+    if format:
+        if format not in ("csv", "ndjson"):
+            raise HTTPException(status_code=400, detail="format must be 'csv' or 'ndjson'")
+        return format
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in CONTENT_TYPE_FORMATS:
+        return CONTENT_TYPE_FORMATS[content_type]
+    raise HTTPException(
+        status_code=415,
+        detail="Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson"
+    )
+
+@router.post("/attendance")
+async def ingest_attendance(
+    request: Request,
+    format: Optional[str] = None,
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=100, le=50000),
+    db=Depends(get_async_db),
+    current_user: schemas.StudentOut = Depends(get_current_staff)
+):
+    """
+    Bulk-load attendance rows (student_id, subject_id, status[, date]) from a
+    streamed CSV or NDJSON body. Rows are validated with AttendanceCreate and
+    inserted in batches; the response has the totals and the first rejects.
+    Staff only.
+    """
+    fmt = resolve_format(request, format)
+    return await ingest_stream(db, "attendance", request.stream(), fmt, batch_size)
+
+@router.post("/marks")
+async def ingest_marks(
+    request: Request,
+    format: Optional[str] = None,
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=100, le=50000),
+    db=Depends(get_async_db),
+    current_user: schemas.StudentOut = Depends(get_current_staff)
+):
+    """
+    Bulk-load marks (student_id, subject_id, exam_type, score, max_score) from
+    a streamed CSV or NDJSON body, validated with MarkCreate. Staff only.
+    """
+    fmt = resolve_format(request, format)
+    return await ingest_stream(db, "marks", request.stream(), fmt, batch_size)
@@ -1,15 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from datetime import datetime
+from typing import List, Dict, Any, Literal, Optional
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.services.scoring import calculate_readiness_score
+from app import schemas
+from app.database import get_db, get_async_db, run_db
+from app.routers.auth import get_current_staff
+from app.core.query_budget import query_budget
+from app.services.scoring import calculate_readiness_score, calculate_readiness_scores_batch
 from app.services.burnout import predictor
-from app.services.placement import predict_placement_probability
+from app.services.burnout_features import score_cohort_burnout
+from app.services.placement import predict_placement_probability, predict_placement_batch
 from app.services.recommendation import get_recommendations_for_skills
-from app.services.roadmap import get_career_roadmap
-from app.services.report import generate_accreditation_report
+from app.services.readiness_engine import run_recompute_job
+from app.services.readiness_trend import get_readiness_trend
+from app.services.roadmap import get_career_roadmap_json
+from app.services.role_fit import DEFAULT_ROLE_LIMIT, get_role_fit
+from app.services.report import generate_accreditation_report, generate_department_report
 
 router = APIRouter()
 
@@ -17,9 +25,26 @@ class ReadinessInput(BaseModel):
     avg_marks: float
     attendance_pct: float
     lab_score: float
-    skill_coverage_pct: float
+    skill_coverage_pct: Optional[float] = None
     project_count: int
     missing_skills: Optional[List[str]] = []
+    # Instead of skill_coverage_pct/missing_skills: derived from the role -> skill
+    # mapping for target_role, or the best-fitting role when it is not given
+    acquired_skills: Optional[List[str]] = None
+    target_role: Optional[str] = None
+
+class BatchReadinessInput(BaseModel):
+    avg_marks: List[float]
+    attendance_pct: List[float]
+    lab_score: List[float]
+    skill_coverage_pct: List[float]
+    project_count: List[int]
+
+class RecomputeInput(BaseModel):
+    student_ids: Optional[List[int]] = None
+    force: bool = False
+    # Rebuild stats from raw history first (implies force)
+    rebuild_stats: bool = False
 
 class BurnoutInput(BaseModel):
     weekly_attendance_trend: float
@@ -32,6 +57,17 @@ class PlacementInput(BaseModel):
     override_skill_score: Optional[float] = None
     override_projects: Optional[int] = None
 
+class BatchPlacementInput(BaseModel):
+    student_ids: Optional[List[int]] = None
+    current_year: Optional[int] = None
+    override_skill_score: Optional[float] = None
+    override_projects: Optional[int] = None
+
+class RoleFitInput(BaseModel):
+    acquired_skills: Optional[List[str]] = None
+    student_id: Optional[int] = None
+    limit: int = DEFAULT_ROLE_LIMIT
+
 class ReportInput(BaseModel):
     department_name: str
     total_students: int
@@ -42,24 +78,103 @@ class ReportInput(BaseModel):
     top_industry_roles: List[str]
 
 @router.post("/readiness-score")
-def get_readiness_score(data: ReadinessInput):
+def get_readiness_score(data: ReadinessInput, db: Session = Depends(get_db)):
+    skill_coverage_pct, missing_skills = data.skill_coverage_pct, data.missing_skills
+    if skill_coverage_pct is None:
+        if data.acquired_skills is None:
+            raise HTTPException(status_code=400, detail="Provide skill_coverage_pct or acquired_skills")
+        fit = get_role_fit(db, acquired_skills=data.acquired_skills, limit=1, role_title=data.target_role)
+        if not fit["roles"]:
+            raise HTTPException(status_code=404, detail="No role with mapped skills found")
+        skill_coverage_pct = fit["roles"][0]["coverage_pct"]
+        missing_skills = fit["roles"][0]["missing_skills"]
     return calculate_readiness_score(
         avg_marks=data.avg_marks,
         attendance_pct=data.attendance_pct,
         lab_score=data.lab_score,
-        skill_coverage_pct=data.skill_coverage_pct,
+        skill_coverage_pct=skill_coverage_pct,
         project_count=data.project_count,
-        missing_skills=data.missing_skills
+        missing_skills=missing_skills
     )
 
+@router.post("/readiness-score/batch")
+def get_readiness_scores_batch(data: BatchReadinessInput):
+    try:
+        return calculate_readiness_scores_batch(
+            avg_marks=data.avg_marks,
+            attendance_pct=data.attendance_pct,
+            lab_score=data.lab_score,
+            skill_coverage_pct=data.skill_coverage_pct,
+            project_count=data.project_count
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/readiness-score/recompute", status_code=202)
+def recompute_readiness_scores(
+    background_tasks: BackgroundTasks,
+    data: Optional[RecomputeInput] = None,
+    current_user: schemas.StudentOut = Depends(get_current_staff)
+):
+    data = data or RecomputeInput()
+    # Runs after the response is sent, in its own session
+    background_tasks.add_task(
+        run_recompute_job, student_ids=data.student_ids, force=data.force, rebuild_stats=data.rebuild_stats
+    )
+    return {"status": "scheduled", "force": data.force or data.rebuild_stats, "rebuild_stats": data.rebuild_stats}
+
+@router.get("/readiness-trend", dependencies=[query_budget(1)])
+async def get_cohort_readiness_trend(
+    student_ids: Optional[List[int]] = Query(None),
+    current_year: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bucket: Literal["raw", "day", "week"] = "day",
+    db=Depends(get_async_db)
+):
+    if student_ids is None and current_year is None:
+        raise HTTPException(status_code=400, detail="Provide student_ids or current_year")
+    try:
+        return await run_db(
+            db,
+            get_readiness_trend,
+            student_ids=student_ids,
+            current_year=current_year,
+            start=start,
+            end=end,
+            bucket=bucket
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/predict-burnout")
 def predict_burnout(data: BurnoutInput):
     return predictor.predict(data.dict())
 
-@router.post("/predict-placement")
-def predict_placement(data: PlacementInput, db: Session = Depends(get_db)):
-    result = predict_placement_probability(
-        db=db,
+@router.get("/burnout-risk/cohort", dependencies=[query_budget(1)])
+async def get_cohort_burnout_risk(
+    student_ids: Optional[List[int]] = Query(None),
+    current_year: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    db=Depends(get_async_db)
+):
+    if student_ids is None and current_year is None:
+        raise HTTPException(status_code=400, detail="Provide student_ids or current_year")
+    results = await run_db(
+        db,
+        score_cohort_burnout,
+        student_ids=student_ids,
+        current_year=current_year,
+        limit=limit
+    )
+    return {"count": len(results), "results": results}
+
+# Student and stats row, plus two grouped raw-history queries for students without stats
+@router.post("/predict-placement", dependencies=[query_budget(4)])
+async def predict_placement(data: PlacementInput, db=Depends(get_async_db)):
+    result = await run_db(
+        db,
+        predict_placement_probability,
         student_id=data.student_id,
         override_skill_score=data.override_skill_score,
         override_projects=data.override_projects
@@ -68,10 +183,43 @@ def predict_placement(data: PlacementInput, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail=result["error"])
     return result
 
-@router.post("/recommendations")
+# Students and stats rows, plus two grouped raw-history queries for any without stats
+@router.post("/predict-placement/batch", dependencies=[query_budget(4)])
+async def predict_placement_for_batch(data: BatchPlacementInput, db=Depends(get_async_db)):
+    if data.student_ids is None and data.current_year is None:
+        raise HTTPException(status_code=400, detail="Provide student_ids or current_year")
+    results = await run_db(
+        db,
+        predict_placement_batch,
+        student_ids=data.student_ids,
+        current_year=data.current_year,
+        override_skill_score=data.override_skill_score,
+        override_projects=data.override_projects
+    )
+    return {"count": len(results), "results": results}
+
+@router.post("/recommendations", dependencies=[query_budget(2)])
 def get_recommendations(missing_skills: List[str], db: Session = Depends(get_db)):
     return get_recommendations_for_skills(db, missing_skills)
 
+# Served from the in-memory bitset index; a cold rebuild adds 3 statements
+@router.post("/role-fit", dependencies=[query_budget(4)])
+async def get_role_fit_ranking(data: RoleFitInput, db=Depends(get_async_db)):
+    if data.acquired_skills is None and data.student_id is None:
+        raise HTTPException(status_code=400, detail="Provide acquired_skills or student_id")
+    if data.limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+    result = await run_db(
+        db,
+        get_role_fit,
+        acquired_skills=data.acquired_skills,
+        student_id=data.student_id,
+        limit=data.limit
+    )
+    if "error" in result:
+        raise HTTPException(status_code=404, detail=result["error"])
+    return result
+
 @router.post("/generate-report")
 def generate_report(data: ReportInput):
     return generate_accreditation_report(
@@ -84,9 +232,15 @@ def generate_report(data: ReportInput):
         top_industry_roles=data.top_industry_roles
     )
 
-@router.get("/roadmap/{student_id}")
-def get_roadmap(student_id: int, db: Session = Depends(get_db)):
-    result = get_career_roadmap(db, student_id)
-    if "error" in result:
-        raise HTTPException(status_code=404, detail=result["error"])
-    return result
+@router.get("/accreditation-report", dependencies=[query_budget(6)])
+async def get_accreditation_report(department_name: str, current_year: Optional[int] = None, db=Depends(get_async_db)):
+    # Aggregates are computed in the database; clients never pull raw rows
+    return await run_db(db, generate_department_report, department_name=department_name, current_year=current_year)
+
+@router.get("/roadmap/{student_id}", dependencies=[query_budget(2)])
+async def get_roadmap(student_id: int, db=Depends(get_async_db)):
+    body = await run_db(db, get_career_roadmap_json, student_id)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Student not found")
+    # Served as pre-serialized bytes straight from the template cache
+    return Response(content=body, media_type="application/json")
@@ -1,61 +1,79 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from typing import List, Literal, Optional
 
 from app import schemas, crud
-from app.database import get_db
+from app.database import get_db, get_async_db, run_db
+from app.core.security import get_password_hash_async, PasswordPoolSaturated
+from app.routers.auth import password_pool_busy
+from app.core.http_cache import etag_matches
+from app.core.query_budget import query_budget
+from app.services.dashboard import dashboard_cache, render_dashboard_summary
+from app.services.readiness_trend import get_readiness_trend
 
 router = APIRouter()
 
 @router.post("/", response_model=schemas.StudentOut)
-def create_student(student: schemas.StudentCreate, db: Session = Depends(get_db)):
-    db_student = crud.get_student_by_email(db, email=student.email)
+async def create_student(student: schemas.StudentCreate, db=Depends(get_async_db)):
+    db_student = await run_db(db, crud.get_student_by_email, email=student.email)
     if db_student:
         raise HTTPException(status_code=400, detail="Email already registered")
-    return crud.create_student(db=db, student=student)
+    try:
+        hashed_password = await get_password_hash_async(student.password)
+    except PasswordPoolSaturated:
+        raise password_pool_busy()
+    return await run_db(db, crud.create_student, student=student, hashed_password=hashed_password)
 
-@router.get("/subjects", response_model=List[schemas.SubjectOut])
+@router.get("/subjects", response_model=List[schemas.SubjectOut], dependencies=[query_budget(1)])
 def read_subjects(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     subjects = crud.get_subjects(db, skip=skip, limit=limit)
     return subjects
 
-@router.get("/{student_id}", response_model=schemas.StudentOut)
-def read_student(student_id: int, db: Session = Depends(get_db)):
-    db_student = crud.get_student(db, student_id=student_id)
+@router.get("/{student_id}", response_model=schemas.StudentOut, dependencies=[query_budget(1)])
+async def read_student(student_id: int, db=Depends(get_async_db)):
+    db_student = await run_db(db, crud.get_student, student_id=student_id)
     if db_student is None:
         raise HTTPException(status_code=404, detail="Student not found")
     return db_student
 
-@router.get("/{student_id}/readiness")
-def get_student_readiness(student_id: int, db: Session = Depends(get_db)):
-    db_readiness = crud.get_readiness_score(db, student_id=student_id)
+@router.get("/{student_id}/readiness", dependencies=[query_budget(1)])
+async def get_student_readiness(student_id: int, db=Depends(get_async_db)):
+    db_readiness = await run_db(db, crud.get_readiness_score, student_id=student_id)
     if db_readiness is None:
         raise HTTPException(status_code=404, detail="Readiness score not found")
     return db_readiness
 
-@router.get("/{student_id}/placement")
-def get_student_placement(student_id: int, db: Session = Depends(get_db)):
-    db_placement = crud.get_placement_prediction(db, student_id=student_id)
+@router.get("/{student_id}/readiness/trend", dependencies=[query_budget(1)])
+async def get_student_readiness_trend(
+    student_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bucket: Literal["raw", "day", "week"] = "day",
+    db=Depends(get_async_db)
+):
+    try:
+        return await run_db(db, get_readiness_trend, student_ids=[student_id], start=start, end=end, bucket=bucket)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{student_id}/placement", dependencies=[query_budget(1)])
+async def get_student_placement(student_id: int, db=Depends(get_async_db)):
+    db_placement = await run_db(db, crud.get_placement_prediction, student_id=student_id)
     if db_placement is None:
         raise HTTPException(status_code=404, detail="Placement prediction not found")
     return db_placement
 
-@router.get("/{student_id}/dashboard-summary")
-def get_dashboard_summary(student_id: int, db: Session = Depends(get_db)):
-    student = crud.get_student(db, student_id=student_id)
-    if not student:
+@router.get("/{student_id}/dashboard-summary", dependencies=[query_budget(1)])
+async def get_dashboard_summary(student_id: int, request: Request, db=Depends(get_async_db)):
+    # Cached per student; the database is only touched on a cache miss
+    rendered = dashboard_cache.get(student_id)
+    if rendered is None:
+        rendered = await run_db(db, render_dashboard_summary, student_id)
+    if rendered is None:
         raise HTTPException(status_code=404, detail="Student not found")
-    
-    readiness = crud.get_readiness_score(db, student_id=student_id)
-    placement = crud.get_placement_prediction(db, student_id=student_id)
-    
-    return {
-        "student": {
-            "id": student.id,
-            "name": student.name,
-            "roll_number": student.roll_number,
-            "email": student.email
-        },
-        "readiness": readiness,
-        "placement": placement
-    }
+
+    headers = {"ETag": rendered["etag"], "Cache-Control": "no-cache"}
+    if etag_matches(request, rendered["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=rendered["body"], media_type="application/json", headers=headers)
@@ -50,6 +50,7 @@ class AttendanceBase(BaseModel):
 
 class AttendanceCreate(AttendanceBase):
     student_id: int
+    date: Optional[datetime] = None # Defaults to now when omitted
 
 class AttendanceOut(AttendanceBase):
     id: int
@@ -74,6 +75,21 @@ class MarkOut(MarkBase):
     class Config:
         from_attributes = True
 
+# --- Lab Performance Schemas ---
+class LabPerformanceBase(BaseModel):
+    subject_id: int
+    score: float
+    max_score: float
+
+class LabPerformanceCreate(LabPerformanceBase):
+    student_id: int
+
+class LabPerformanceOut(LabPerformanceBase):
+    id: int
+    student_id: int
+    class Config:
+        from_attributes = True
+
 # --- Generic Token ---
 class Token(BaseModel):
     access_token: str
@@ -92,10 +108,16 @@ class SharedMaterialBase(BaseModel):
 class SharedMaterialCreate(SharedMaterialBase):
     file_path: str
     uploader_id: int
+    file_name: Optional[str] = None
+    content_hash: Optional[str] = None
+    file_size: Optional[int] = None
 
 class SharedMaterialOut(SharedMaterialBase):
     id: int
     file_path: str
+    file_name: Optional[str] = None
+    content_hash: Optional[str] = None
+    file_size: Optional[int] = None
     uploader_id: int
     created_at: datetime
     class Config:
@@ -0,0 +1,206 @@
+"""
+Endpoint benchmark on a seeded local SQLite database.
+
+Usage:
+    python app/scripts/benchmark.py --scale 10k [--concurrency 16] [--requests 500]
+        [--db /tmp/bench.db] [--rebuild] [--output bench.json]
+
+Builds the database from schema.sql + MIGRATION.sql, seeds it with the
+synthetic dataset generator at the requested scale (reused on later runs), drives the
+app in-process at fixed concurrency and writes p50/p95/p99 latency,
+throughput and queries per request for each hot endpoint as JSON.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.append(PROJECT_ROOT)
+
+SCALES = {"1k": 1000, "10k": 10000, "100k": 100000}
+SEED = 42
+BENCH_PASSWORD = "benchmark-password"
+SEED_END_DATE = datetime(2026, 1, 1)
+
+def parse_scale(value: str) -> int:
+    return SCALES.get(value.lower()) or int(value)
+
+def configure_environment(db_path: str) -> None:
+    # Must run before anything from app is imported: settings read the env once
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["METRICS_ENABLED"] = "true"
+    os.environ.setdefault("QUERY_BUDGET_MODE", "warn")
+
+def seed_database(students: int) -> None:
+    """Deterministic seed: the same scale always produces the same rows."""
+    from app.scripts.generate_dataset import generate_dataset
+
+    generate_dataset(students, seed=SEED, end_date=SEED_END_DATE, password=BENCH_PASSWORD)
+
+def prepare_database(db_path: str, students: int, rebuild: bool) -> dict:
+    if rebuild and os.path.exists(db_path):
+        os.remove(db_path)
+    if os.path.exists(db_path):
+        with sqlite3.connect(db_path) as conn:
+            existing = conn.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+        if existing == students:
+            return {"reused": True}
+        os.remove(db_path)
+
+    from app.database import engine
+    from app.scripts.local_schema import build_schema
+
+    started = time.perf_counter()
+    drift = build_schema(engine)
+    seed_database(students)
+    return {"reused": False, "seed_seconds": round(time.perf_counter() - started, 2), "schema_drift": drift}
+
+def percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def endpoint_scenarios(students: int):
+    """name -> (request count key, builder(rng) -> (method, url, kwargs))"""
+    from app.scripts.generate_dataset import synthetic_email
+
+    return {
+        "predict_placement": ("requests", lambda rng: (
+            "POST", "/api/v1/predictions/predict-placement", {"json": {"student_id": rng.randint(1, students)}}
+        )),
+        "dashboard_summary": ("requests", lambda rng: (
+            "GET", f"/api/v1/students/{rng.randint(1, students)}/dashboard-summary", {}
+        )),
+        "materials": ("requests", lambda rng: (
+            "GET", "/api/v1/collaboration/materials", {"params": {"limit": 50}}
+        )),
+        "login": ("login_requests", lambda rng: (
+            "POST", "/api/v1/auth/login",
+            {"data": {"username": synthetic_email(SEED, rng.randint(1, students)), "password": BENCH_PASSWORD}}
+        )),
+    }
+
+async def run_scenario(client, build, total: int, concurrency: int, query_log: list, seed: int = SEED) -> dict:
+    rng = random.Random(seed)
+    requests = [build(rng) for _ in range(total)]
+    latencies, errors = [], 0
+    query_log.clear()
+    next_index = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in next_index:
+            method, url, kwargs = requests[i]
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    queries = list(query_log)
+    return {
+        "requests": total,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "throughput_rps": round(total / wall, 2) if wall else 0.0,
+        "queries_per_request_avg": round(sum(queries) / len(queries), 3) if queries else 0.0,
+        "queries_per_request_max": max(queries) if queries else 0,
+    }
+
+async def run_benchmarks(args, students: int) -> dict:
+    import httpx
+    from app.main import app
+    from app.core.metrics import request_finished_hooks
+
+    query_log = []
+    request_finished_hooks.append(lambda stats: query_log.append(stats.queries))
+    counts = {"requests": args.requests, "login_requests": args.login_requests}
+    selected = args.endpoints.split(",") if args.endpoints else None
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, (count_key, build) in endpoint_scenarios(students).items():
+                if selected and name not in selected:
+                    continue
+                # Warm-up pass (caches, connection pool) is not recorded; its own
+                # seed keeps it from pre-caching the measured requests
+                await run_scenario(client, build, min(args.warmup, counts[count_key]), args.concurrency, query_log, SEED + 1)
+                # App debug prints would drown the report
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results[name] = await run_scenario(client, build, counts[count_key], args.concurrency, query_log)
+                print(f"  {name}: p50 {results[name]['p50_ms']} ms, p99 {results[name]['p99_ms']} ms, "
+                      f"{results[name]['throughput_rps']} req/s, {results[name]['queries_per_request_avg']} queries/req")
+    return results
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hot endpoints against a seeded SQLite database.")
+    parser.add_argument("--scale", default="1k", help="1k, 10k, 100k or a student count")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint")
+    parser.add_argument("--login-requests", type=int, default=50, help="login is bcrypt-bound; keep this small")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--endpoints", default="", help="comma-separated subset, e.g. materials,login")
+    parser.add_argument("--db", default="", help="SQLite file (default: temp dir, reused per scale)")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild and reseed the database")
+    parser.add_argument("--output", default="", help="JSON results path (default: bench-<scale>-<commit>.json)")
+    args = parser.parse_args()
+
+    students = parse_scale(args.scale)
+    db_path = args.db or os.path.join(tempfile.gettempdir(), f"edunexus_bench_{students}.db")
+    configure_environment(db_path)
+
+    print(f"Preparing {students} students in {db_path}...")
+    database = prepare_database(db_path, students, args.rebuild)
+    print(f"Running benchmarks at concurrency {args.concurrency}...")
+    endpoints = asyncio.run(run_benchmarks(args, students))
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "git_commit": commit,
+            "students": students,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "database": {"path": db_path, **database},
+        },
+        "endpoints": endpoints,
+    }
+    output = args.output or f"bench-{students}-{commit[:8]}.json"
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from app.database import SessionLocal
+from app.services.readiness_trend import compact_readiness_history
+
+def compact():
+    db = SessionLocal()
+    try:
+        print("Compacting readiness_history...")
+        result = compact_readiness_history(db)
+        for target, counts in result.items():
+            print(f"  -> {counts['source_rows']} rows rolled into {counts['buckets']} {target} buckets")
+        print("Compaction complete.")
+    except Exception as e:
+        print(f"Error compacting readiness history: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    # Usage: python app/scripts/compact_readiness_history.py
+    compact()
@@ -0,0 +1,351 @@
+"""
+High-volume synthetic dataset generator for scale and load testing.
+
+Usage:
+    python app/scripts/generate_dataset.py --students 100000 [--seed 42] [--days 90]
+        [--history-weeks 26] [--materials 5000] [--end-date 2026-01-01]
+        [--database-url sqlite:////tmp/scale.db] [--init-schema] [--skip-derived]
+
+Writes students (per-year subject enrolment), per-class-day attendance,
+assignment/midterm/final marks, lab scores, weekly readiness history and
+shared materials metadata with batched bulk inserts, then rebuilds
+student_academic_stats and readiness scores. Works against SQLite and
+Postgres; the same seed, scale and end date always produce the same rows.
+
+Each student batch commits with all of its rows, so an interrupted run is
+resumed by re-running the same command (same --seed and --end-date): it
+continues after the highest roll number already generated for the seed,
+skips the materials if they were written, and redoes the derived rebuild.
+"""
+import argparse
+import hashlib
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+DEFAULT_SEED = 42
+DEFAULT_DAYS = 90
+DEFAULT_HISTORY_WEEKS = 26
+DEFAULT_STUDENT_BATCH = 2000
+INSERT_BATCH_SIZE = 10000
+DEFAULT_PASSWORD = "synthetic123"
+DECLINING_SHARE = 0.12  # students whose attendance and marks slide over the window
+
+# (name, code, credits, year): six subjects per year, students take their year's subjects
+SUBJECT_CATALOG = [
+    ("Programming Fundamentals", "SYN101", 4, 1), ("Engineering Mathematics I", "SYN102", 4, 1),
+    ("Digital Logic", "SYN103", 3, 1), ("Physics for Computing", "SYN104", 3, 1),
+    ("Technical Communication", "SYN105", 2, 1), ("Python Programming", "SYN106", 3, 1),
+    ("Data Structures", "SYN201", 4, 2), ("Discrete Mathematics", "SYN202", 3, 2),
+    ("Database Systems", "SYN203", 4, 2), ("Computer Organization", "SYN204", 3, 2),
+    ("Object Oriented Design", "SYN205", 3, 2), ("Probability and Statistics", "SYN206", 3, 2),
+    ("Algorithms", "SYN301", 4, 3), ("Operating Systems", "SYN302", 4, 3),
+    ("Computer Networks", "SYN303", 3, 3), ("Machine Learning", "SYN304", 4, 3),
+    ("Web Engineering", "SYN305", 3, 3), ("Software Engineering", "SYN306", 3, 3),
+    ("Cloud Computing", "SYN401", 3, 4), ("Distributed Systems", "SYN402", 4, 4),
+    ("Deep Learning", "SYN403", 4, 4), ("Information Security", "SYN404", 3, 4),
+    ("DevOps Practices", "SYN405", 3, 4), ("Capstone Project", "SYN406", 4, 4),
+]
+FIRST_NAMES = (
+    "Aarav", "Aditi", "Arjun", "Ananya", "Dev", "Diya", "Farhan", "Fatima", "Ishaan", "Isha",
+    "Kabir", "Kavya", "Meera", "Mohan", "Nikhil", "Neha", "Omar", "Priya", "Rahul", "Riya",
+    "Sahil", "Sara", "Tanvi", "Varun", "Vikram", "Zara", "Aisha", "Rohan", "Sneha", "Yash",
+)
+LAST_NAMES = (
+    "Sharma", "Patel", "Reddy", "Iyer", "Khan", "Singh", "Gupta", "Nair", "Das", "Mehta",
+    "Joshi", "Kulkarni", "Rao", "Bose", "Chopra", "Menon", "Pillai", "Verma", "Ali", "Kapoor",
+)
+# (exam type, stage): stage drives the decline of struggling students across the term
+EXAMS = (("Assignment", 1), ("Assignment", 1), ("Midterm", 2), ("Final", 3))
+LABS_PER_SUBJECT = 3
+MATERIAL_CATEGORIES = ("Notes", "Lab", "Assignments", "PrevPapers")
+DUPLICATE_UPLOAD_SHARE = 0.1  # re-uploads of an existing file share its content_hash and file_path
+
+def roll_number(seed: int, index: int) -> str:
+    return f"SYN{seed}-{index:07d}"
+
+def synthetic_email(seed: int, index: int) -> str:
+    return f"student{index}.s{seed}@synthetic.edunexus.test"
+
+def _generated_students(conn, student_table, seed: int) -> List[tuple]:
+    """(index, student_id) of every student already generated for the seed, in index order."""
+    prefix = roll_number(seed, 0)[:-7]
+    rows = conn.execute(
+        student_table.select().with_only_columns(student_table.c.roll_number, student_table.c.id)
+        .where(student_table.c.roll_number.like(f"{prefix}%"))
+    ).all()
+    return sorted((int(roll[len(prefix):]), student_id) for roll, student_id in rows)
+
+def _clamp(value: float, low: float = 0.0, high: float = 100.0) -> float:
+    return round(min(high, max(low, value)), 2)
+
+def _insert(conn, table, rows: List[Dict[str, Any]], batch_size: int) -> int:
+    for start in range(0, len(rows), batch_size):
+        conn.execute(table.insert(), rows[start:start + batch_size])
+    return len(rows)
+
+def class_schedule(subject_codes: Iterable[str], start: datetime, end: datetime) -> Dict[str, List[datetime]]:
+    """Each subject meets on three fixed weekdays at a fixed hour."""
+    schedule = {}
+    for k, code in enumerate(sorted(subject_codes)):
+        weekdays = {k % 5, (k + 2) % 5, (k + 4) % 5}
+        hour = 9 + k % 6
+        day, sessions = start, []
+        while day < end:
+            if day.weekday() in weekdays:
+                sessions.append(day.replace(hour=hour))
+            day += timedelta(days=1)
+        schedule[code] = sessions
+    return schedule
+
+def _student_profile(rng: random.Random) -> Dict[str, Any]:
+    declining = rng.random() < DECLINING_SHARE
+    return {
+        "ability": rng.gauss(68, 12),
+        "attendance_rate": rng.betavariate(9, 1.6),
+        "lab_bias": rng.gauss(4, 6),
+        "declining": declining,
+        # How far attendance falls by the end of the window, and marks per exam stage
+        "attendance_drop": rng.uniform(0.2, 0.45) if declining else 0.0,
+        "marks_drop": rng.uniform(5, 12) if declining else 0.0,
+    }
+
+def _student_rows(
+    student_id: int, profile: Dict[str, Any], rng: random.Random, subjects: List[tuple],
+    schedule: Dict[str, List[datetime]], window_start: datetime, window_days: int,
+    history_weeks: int, end: datetime, out: Dict[str, list]
+) -> None:
+    """Append one student's attendance, marks, labs and readiness history to out."""
+    window_seconds = window_days * 86400
+    for subject_id, code in subjects:
+        difficulty = rng.gauss(0, 5)
+        for session in schedule[code]:
+            progress = (session - window_start).total_seconds() / window_seconds
+            rate = profile["attendance_rate"] - profile["attendance_drop"] * progress
+            out["attendance"].append({
+                "student_id": student_id, "subject_id": subject_id, "date": session,
+                "status": rng.random() < rate
+            })
+        for exam_type, stage in EXAMS:
+            score = profile["ability"] - difficulty - profile["marks_drop"] * (stage - 1) + rng.gauss(0, 8)
+            out["marks"].append({
+                "student_id": student_id, "subject_id": subject_id, "exam_type": exam_type,
+                "score": _clamp(score), "max_score": 100.0
+            })
+        for _ in range(LABS_PER_SUBJECT):
+            out["labs"].append({
+                "student_id": student_id, "subject_id": subject_id,
+                "score": _clamp(profile["ability"] + profile["lab_bias"] + rng.gauss(0, 7)), "max_score": 100.0
+            })
+
+    # Weekly snapshots drifting towards the student's current standing
+    current = 0.5 * profile["ability"] + 40 * (profile["attendance_rate"] - profile["attendance_drop"])
+    start_score = current + (profile["marks_drop"] * 1.5 if profile["declining"] else rng.gauss(-6, 4))
+    for week in range(history_weeks, 0, -1):
+        progress = 1 - week / history_weeks
+        score = start_score + (current - start_score) * progress + rng.gauss(0, 2.5)
+        out["history"].append({
+            "student_id": student_id, "score": _clamp(score),
+            "recorded_at": end - timedelta(weeks=week, hours=rng.randint(0, 48)),
+            "granularity": "raw", "sample_count": 1
+        })
+
+def _ensure_subjects(conn, models) -> Dict[int, List[tuple]]:
+    """Insert missing catalog subjects; returns year -> [(subject_id, code)]."""
+    table = models.Subject.__table__
+    codes = [code for _, code, _, _ in SUBJECT_CATALOG]
+    existing = dict(conn.execute(table.select().with_only_columns(table.c.code, table.c.id).where(table.c.code.in_(codes))).all())
+    missing = [
+        {"name": name, "code": code, "credits": credits}
+        for name, code, credits, _ in SUBJECT_CATALOG if code not in existing
+    ]
+    if missing:
+        conn.execute(table.insert(), missing)
+        existing = dict(conn.execute(table.select().with_only_columns(table.c.code, table.c.id).where(table.c.code.in_(codes))).all())
+    by_year: Dict[int, List[tuple]] = {}
+    for _, code, _, year in SUBJECT_CATALOG:
+        by_year.setdefault(year, []).append((existing[code], code))
+    return by_year
+
+def _materials(seed: int, count: int, student_ids: List[int], subject_ids: List[int], start: datetime, window_days: int):
+    rng = random.Random(f"{seed}:materials")
+    files = []  # (content_hash, file_path, file_size) of earlier uploads, for re-uploads
+    for i in range(count):
+        if files and rng.random() < DUPLICATE_UPLOAD_SHARE:
+            content_hash, file_path, file_size = rng.choice(files)
+        else:
+            content_hash = hashlib.sha256(f"{seed}:material:{i}".encode()).hexdigest()
+            file_path = f"uploads/materials/{content_hash}.pdf"
+            file_size = int(rng.lognormvariate(13, 1))
+            files.append((content_hash, file_path, file_size))
+        category = rng.choice(MATERIAL_CATEGORIES)
+        yield {
+            "title": f"{category} {i + 1}",
+            "description": f"Synthetic {category.lower()} upload" if rng.random() < 0.6 else None,
+            "category": category,
+            "file_path": file_path,
+            "file_name": f"{category.lower()}-{i + 1}.pdf",
+            "content_hash": content_hash,
+            "file_size": file_size,
+            "subject_id": rng.choice(subject_ids),
+            "uploader_id": rng.choice(student_ids),
+            "created_at": start + timedelta(seconds=rng.randrange(window_days * 86400))
+        }
+
+def generate_dataset(
+    students: int,
+    seed: int = DEFAULT_SEED,
+    days: int = DEFAULT_DAYS,
+    history_weeks: int = DEFAULT_HISTORY_WEEKS,
+    materials: Optional[int] = None,
+    end_date: Optional[datetime] = None,
+    password: str = DEFAULT_PASSWORD,
+    student_batch: int = DEFAULT_STUDENT_BATCH,
+    batch_size: int = INSERT_BATCH_SIZE,
+    derived: bool = True,
+) -> Dict[str, Any]:
+    """
+    Generate `students` synthetic students into the configured database.
+    Each student draws from its own seeded RNG, so output does not depend on
+    batch sizes. Student batches commit as they go; if the seed was partly
+    generated before, generation resumes after the highest existing index.
+    Returns row counts.
+    """
+    from app import models
+    from app.core.security import get_password_hash
+    from app.database import SessionLocal, engine
+    from app.services.academic_stats import rebuild_academic_stats
+    from app.services.readiness_engine import recompute_readiness
+
+    end = end_date or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    window_start = end - timedelta(days=days)
+    materials = max(100, students // 20) if materials is None else materials
+    # One bcrypt hash for everyone: hashing per student would take hours
+    password_hash = get_password_hash(password)
+    counts = {"students": 0, "attendance": 0, "marks": 0, "labs": 0, "history": 0, "materials": 0}
+    student_table = models.Student.__table__
+
+    with engine.begin() as conn:
+        generated = _generated_students(conn, student_table, seed)
+        subjects_by_year = _ensure_subjects(conn, models)
+    schedule = class_schedule([code for year in subjects_by_year.values() for _, code in year], window_start, end)
+
+    # Batches commit whole and in index order, so everything up to the highest index is complete
+    resume_after = generated[-1][0] if generated else 0
+    student_ids: List[int] = [student_id for _, student_id in generated]
+    counts["resumed_after"] = resume_after
+    if resume_after:
+        print(f"  Seed {seed}: {resume_after} students already generated, resuming")
+    for batch_start in range(resume_after + 1, students + 1, student_batch):
+        indexes = range(batch_start, min(batch_start + student_batch, students + 1))
+        rngs = {i: random.Random(f"{seed}:{i}") for i in indexes}
+        rows, profiles = [], {}
+        for i in indexes:
+            rng = rngs[i]
+            year = 1 + rng.randrange(4)
+            profiles[i] = (year, _student_profile(rng))
+            rows.append({
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "roll_number": roll_number(seed, i),
+                "email": synthetic_email(seed, i),
+                "hashed_password": password_hash,
+                "current_year": year,
+                "created_at": end - timedelta(days=365 * (year - 1) + rng.randrange(30, 60))
+            })
+
+        with engine.begin() as conn:
+            counts["students"] += _insert(conn, student_table, rows, batch_size)
+            ids = dict(conn.execute(
+                student_table.select().with_only_columns(student_table.c.roll_number, student_table.c.id)
+                .where(student_table.c.roll_number.in_([row["roll_number"] for row in rows]))
+            ).all())
+
+            out = {"attendance": [], "marks": [], "labs": [], "history": []}
+            for i in indexes:
+                year, profile = profiles[i]
+                student_id = ids[roll_number(seed, i)]
+                student_ids.append(student_id)
+                _student_rows(
+                    student_id, profile, rngs[i], subjects_by_year[year], schedule,
+                    window_start, days, history_weeks, end, out
+                )
+            counts["attendance"] += _insert(conn, models.AttendanceRecord.__table__, out["attendance"], batch_size)
+            counts["marks"] += _insert(conn, models.Mark.__table__, out["marks"], batch_size)
+            counts["labs"] += _insert(conn, models.LabPerformance.__table__, out["labs"], batch_size)
+            counts["history"] += _insert(conn, models.ReadinessHistory.__table__, out["history"], batch_size)
+        print(f"  {indexes[-1]}/{students} students")
+
+    subject_ids = [subject_id for year in subjects_by_year.values() for subject_id, _ in year]
+    material_table = models.SharedMaterial.__table__
+    first_hash = hashlib.sha256(f"{seed}:material:0".encode()).hexdigest()
+    with engine.begin() as conn:
+        # Materials go in one transaction: either the seed's first upload exists or none do
+        if conn.execute(
+            material_table.select().with_only_columns(material_table.c.id)
+            .where(material_table.c.content_hash == first_hash).limit(1)
+        ).first() is None:
+            counts["materials"] = _insert(
+                conn, material_table,
+                list(_materials(seed, materials, student_ids, subject_ids, window_start, days)), batch_size
+            )
+
+    if derived:
+        print("Rebuilding academic stats and readiness scores...")
+        db = SessionLocal()
+        try:
+            counts["stats_rows"] = 0
+            for start in range(0, len(student_ids), student_batch):
+                counts["stats_rows"] += rebuild_academic_stats(db, student_ids[start:start + student_batch])
+                db.commit()
+            # Only students with new stats are stale, i.e. the ones just generated
+            counts["readiness_recomputed"] = recompute_readiness(db)["recomputed"]
+        finally:
+            db.close()
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a large deterministic synthetic dataset.")
+    parser.add_argument("--students", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="attendance window ending at --end-date")
+    parser.add_argument("--history-weeks", type=int, default=DEFAULT_HISTORY_WEEKS)
+    parser.add_argument("--materials", type=int, default=None, help="default: students / 20 (at least 100)")
+    parser.add_argument("--end-date", default="", help="YYYY-MM-DD (default: today); fix it for identical reruns")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="password shared by every synthetic student")
+    parser.add_argument("--batch-size", type=int, default=INSERT_BATCH_SIZE, help="rows per INSERT")
+    parser.add_argument("--database-url", default="", help="target database (default: DATABASE_URL)")
+    parser.add_argument("--init-schema", action="store_true", help="apply schema.sql + MIGRATION.sql first")
+    parser.add_argument("--skip-derived", action="store_true", help="skip the stats and readiness rebuild")
+    args = parser.parse_args()
+
+    # Settings read the environment once, on first import of app
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    from app.database import engine
+
+    try:
+        if args.init_schema:
+            from app.scripts.local_schema import build_schema
+            print("Applying schema...")
+            build_schema(engine)
+        end_date = datetime.strptime(args.end_date, "%Y-%m-%d") if args.end_date else None
+        started = time.perf_counter()
+        print(f"Generating {args.students} students (seed {args.seed}) into {engine.url.render_as_string()}...")
+        counts = generate_dataset(
+            args.students, seed=args.seed, days=args.days, history_weeks=args.history_weeks,
+            materials=args.materials, end_date=end_date, password=args.password,
+            batch_size=args.batch_size, derived=not args.skip_derived
+        )
+        print(f"Done in {time.perf_counter() - started:.1f}s: {counts}")
+    except Exception as e:
+        print(f"Error generating dataset: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
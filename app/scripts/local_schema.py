@@ -0,0 +1,133 @@
+import sys
+import os
+import re
+from typing import Dict, List
+
+# Add project root to path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.append(PROJECT_ROOT)
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateColumn
+
+from app.database import Base
+from app import models  # noqa: F401  (registers every table on Base.metadata)
+
+SCHEMA_FILES = ("schema.sql", "MIGRATION.sql")
+
+# Postgres-only DDL in the SQL files -> SQLite equivalents
+SQLITE_REWRITES = [
+    (re.compile(r"\bSERIAL PRIMARY KEY\b", re.IGNORECASE), "INTEGER PRIMARY KEY"),
+    (re.compile(r"\bJSONB\b", re.IGNORECASE), "TEXT"),
+    (re.compile(r"\bTIMESTAMP WITH TIME ZONE\b", re.IGNORECASE), "TIMESTAMP"),
+    (re.compile(r"DEFAULT \(NOW\(\) AT TIME ZONE '\w+'\)", re.IGNORECASE), "DEFAULT CURRENT_TIMESTAMP"),
+    (re.compile(r"DEFAULT NOW\(\)", re.IGNORECASE), "DEFAULT CURRENT_TIMESTAMP"),
+    (re.compile(r"ADD COLUMN IF NOT EXISTS", re.IGNORECASE), "ADD COLUMN"),
+]
+
+def split_sql(script: str) -> List[str]:
+    """Split a SQL file into statements, dropping -- comments."""
+    lines = [line.split("--", 1)[0] for line in script.splitlines()]
+    return [stmt.strip() for stmt in "\n".join(lines).split(";") if stmt.strip()]
+
+def to_dialect(statement: str, dialect: str) -> str:
+    if dialect != "sqlite":
+        return statement
+    return to_sqlite(statement)
+
+def to_sqlite(statement: str) -> str:
+    for pattern, replacement in SQLITE_REWRITES:
+        statement = pattern.sub(replacement, statement)
+    return statement
+
+def _run(engine: Engine, statement: str) -> str:
+    """Execute one statement; returns "" on success or the error message."""
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(statement))
+        return ""
+    except DBAPIError as e:
+        return str(e.orig)
+
+# Error fragments (SQLite, Postgres) that mean "already applied" or "table not created yet"
+_ALREADY_APPLIED = ("duplicate column", "already exists")
+_MISSING_TABLE = ("no such table", "does not exist")
+
+def _is_already_applied(error: str) -> bool:
+    return any(fragment in error for fragment in _ALREADY_APPLIED)
+
+def _indexed_columns(engine: Engine, table: str) -> set:
+    """Column tuples covered by an index, including SQLite's autoindexes for UNIQUE."""
+    with engine.connect() as conn:
+        names = [row[1] for row in conn.execute(text(f"PRAGMA index_list('{table}')"))]
+        return {
+            tuple(row[2] for row in conn.execute(text(f"PRAGMA index_info('{name}')")))
+            for name in names
+        }
+
+def build_schema(engine: Engine) -> Dict[str, List[str]]:
+    """
+    Build the schema from schema.sql and MIGRATION.sql on SQLite (DDL
+    translated) or Postgres (as written). Re-running is safe.
+
+    Verification SELECTs are skipped. Statements that touch a table the SQL
+    files never create are retried after the ORM creates the missing tables,
+    and any column the models have but the SQL files lack is added at the end.
+    Both are reported as drift so the SQL files can be brought up to date.
+    """
+    dialect = engine.dialect.name
+    deferred = []
+    for name in SCHEMA_FILES:
+        with open(os.path.join(PROJECT_ROOT, name)) as f:
+            statements = split_sql(f.read())
+        for statement in statements:
+            if statement.upper().startswith("SELECT"):
+                continue
+            statement = to_dialect(statement, dialect)
+            error = _run(engine, statement)
+            if any(fragment in error for fragment in _MISSING_TABLE) and not _is_already_applied(error):
+                deferred.append(statement)
+            elif error and not _is_already_applied(error):
+                raise RuntimeError(f"{name}: {error}\n{statement}")
+
+    existing = set(inspect(engine).get_table_names())
+    missing_tables = [table.name for table in Base.metadata.sorted_tables if table.name not in existing]
+    Base.metadata.create_all(bind=engine, tables=[Base.metadata.tables[name] for name in missing_tables])
+    for statement in deferred:
+        error = _run(engine, statement)
+        if error and not _is_already_applied(error):
+            raise RuntimeError(f"{error}\n{statement}")
+
+    missing_columns = []
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in present:
+                ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                _run(engine, f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+                missing_columns.append(f"{table.name}.{column.name}")
+
+    if dialect != "sqlite":
+        return {"tables_created_from_models": missing_tables, "columns_added_from_models": missing_columns}
+
+    # Model indexes are reported, not created: the database should index like
+    # one built from the SQL files in production
+    missing_indexes = []
+    for table in Base.metadata.sorted_tables:
+        if table.name in missing_tables:
+            continue
+        indexed = _indexed_columns(engine, table.name)
+        indexed.add(tuple(inspector.get_pk_constraint(table.name)["constrained_columns"]))
+        for index in table.indexes:
+            columns = tuple(column.name for column in index.columns)
+            if columns not in indexed:
+                missing_indexes.append(f"{table.name}({', '.join(columns)})")
+
+    return {
+        "tables_created_from_models": missing_tables,
+        "columns_added_from_models": missing_columns,
+        "model_indexes_missing_from_sql": missing_indexes
+    }
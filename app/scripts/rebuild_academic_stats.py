@@ -0,0 +1,27 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from app.database import SessionLocal
+from app.services.academic_stats import rebuild_academic_stats
+
+def rebuild(student_ids=None):
+    db = SessionLocal()
+    try:
+        scope = f"{len(student_ids)} students" if student_ids else "all students"
+        print(f"Rebuilding student_academic_stats for {scope}...")
+        written = rebuild_academic_stats(db, student_ids=student_ids)
+        db.commit()
+        print(f"Rebuild complete: {written} stats rows written.")
+    except Exception as e:
+        print(f"Error rebuilding stats: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    # Usage: python app/scripts/rebuild_academic_stats.py [student_id ...]
+    ids = [int(arg) for arg in sys.argv[1:]] or None
+    rebuild(ids)
@@ -0,0 +1,31 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from app.database import SessionLocal
+from app.services.readiness_engine import recompute_readiness
+
+def recompute(student_ids=None, force=False, rebuild_stats=False):
+    db = SessionLocal()
+    try:
+        mode = "rebuild stats, all" if rebuild_stats else "all" if force else "stale"
+        scope = f"{len(student_ids)} students" if student_ids else "all students"
+        print(f"Recomputing readiness ({mode}) for {scope}...")
+        summary = recompute_readiness(db, student_ids=student_ids, force=force, rebuild_stats=rebuild_stats)
+        print(f"Recompute complete: {summary['recomputed']} of {summary['candidates']} students "
+              f"in {summary['batches']} batches ({summary['stats_rebuilt']} stats rebuilt from raw history).")
+    except Exception as e:
+        print(f"Error recomputing readiness: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    # Usage: python app/scripts/recompute_readiness.py [--force] [--rebuild-stats] [student_id ...]
+    args = sys.argv[1:]
+    force = "--force" in args
+    rebuild_stats = "--rebuild-stats" in args
+    ids = [int(arg) for arg in args if not arg.startswith("--")] or None
+    recompute(ids, force, rebuild_stats)
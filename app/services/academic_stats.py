@@ -0,0 +1,256 @@
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from sqlalchemy import and_, bindparam, exists, func, case, insert, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models import Student, StudentAcademicStats, AttendanceRecord, Mark, LabPerformance
+
+OVERALL_SUBJECT_ID = 0
+STATS_BATCH_SIZE = 5000
+# Students per transaction when rebuilding stats rows for many students
+REBUILD_STUDENT_BATCH_SIZE = 1000
+# First key of the Postgres advisory locks that serialise stats writers per student
+STATS_LOCK_NAMESPACE = 7301
+
+COUNTER_COLUMNS = (
+    "attendance_present",
+    "attendance_total",
+    "marks_sum",
+    "marks_count",
+    "lab_sum",
+    "lab_count",
+)
+
+def _upsert_statement(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(StudentAcademicStats)
+    if dialect == "sqlite":
+        return sqlite.insert(StudentAcademicStats)
+    return None
+
+def lock_student_stats(db: Session, student_ids: Optional[List[int]]) -> None:
+    """
+    Serialise stats writers for the given students (everyone when None) until
+    the transaction ends, so a rebuild cannot lose a concurrent bump.
+    Postgres: one advisory lock per student, taken in id order, or a table
+    lock for a full rebuild. SQLite needs nothing here: once a transaction
+    has written, it is the only writer until it commits.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    if student_ids is None:
+        db.execute(text("LOCK TABLE student_academic_stats IN SHARE ROW EXCLUSIVE MODE"))
+        return
+    ids = sorted(set(student_ids))
+    if not ids:
+        return
+    db.execute(
+        text(
+            "SELECT pg_advisory_xact_lock(:namespace, id) "
+            "FROM (SELECT unnest(:ids) AS id ORDER BY id) AS locked"
+        ).bindparams(bindparam("ids", type_=postgresql.ARRAY(postgresql.INTEGER))),
+        {"namespace": STATS_LOCK_NAMESPACE, "ids": ids}
+    )
+
+def _seed_missing_stats(db: Session, student_ids: List[int]) -> set:
+    """
+    Build stats rows from raw history for students that have none yet, so
+    their first bump does not start a partial row that hides older history.
+    Returns the ids that were seeded.
+    """
+    have = {
+        row.student_id for row in db.query(StudentAcademicStats.student_id).filter(
+            StudentAcademicStats.student_id.in_(student_ids),
+            StudentAcademicStats.subject_id == OVERALL_SUBJECT_ID
+        )
+    }
+    missing = [student_id for student_id in student_ids if student_id not in have]
+    if missing:
+        rebuild_academic_stats(db, missing)
+    return set(missing)
+
+def accumulate_deltas(totals: Dict[tuple, Dict[str, Any]], student_id: int, subject_id: Optional[int], **counters) -> None:
+    """Add counters to both the (student, subject) and the overall key in totals."""
+    keys = [(student_id, OVERALL_SUBJECT_ID)]
+    if subject_id is not None and subject_id != OVERALL_SUBJECT_ID:
+        keys.append((student_id, subject_id))
+    for key in keys:
+        row = totals.setdefault(key, {col: 0 for col in COUNTER_COLUMNS})
+        for col, value in counters.items():
+            row[col] += value or 0
+
+def apply_stat_deltas(db: Session, totals: Dict[tuple, Dict[str, Any]]) -> None:
+    """
+    Add accumulated deltas to the stats rows, one upsert per STATS_BATCH_SIZE
+    keys. Runs inside the caller's transaction; nothing is committed here.
+
+    The raw rows behind the deltas must already be in the session: students
+    without a stats row yet are seeded from their full raw history (which
+    then includes those rows) instead of receiving the deltas.
+    """
+    if not totals:
+        return
+    db.flush()
+    student_ids = sorted({student_id for student_id, _ in totals})
+    lock_student_stats(db, student_ids)
+    seeded = _seed_missing_stats(db, student_ids)
+    totals = {key: counters for key, counters in totals.items() if key[0] not in seeded}
+    if not totals:
+        return
+    now = datetime.utcnow()
+    # Sorted keys keep lock order stable between concurrent writers
+    values = [
+        {"student_id": student_id, "subject_id": subject_id, **counters, "updated_at": now}
+        for (student_id, subject_id), counters in sorted(totals.items())
+    ]
+
+    stmt = _upsert_statement(db)
+    if stmt is not None:
+        for start in range(0, len(values), STATS_BATCH_SIZE):
+            # Atomic INSERT ... ON CONFLICT DO UPDATE SET col = col + excluded.col
+            chunk_stmt = stmt.values(values[start:start + STATS_BATCH_SIZE])
+            update_cols = {
+                col: getattr(StudentAcademicStats, col) + getattr(chunk_stmt.excluded, col)
+                for col in COUNTER_COLUMNS
+            }
+            update_cols["updated_at"] = chunk_stmt.excluded.updated_at
+            db.execute(chunk_stmt.on_conflict_do_update(
+                index_elements=["student_id", "subject_id"],
+                set_=update_cols
+            ))
+        return
+
+    # Generic fallback for dialects without ON CONFLICT support
+    for row in values:
+        stats = db.get(StudentAcademicStats, (row["student_id"], row["subject_id"]), with_for_update=True)
+        if stats is None:
+            db.add(StudentAcademicStats(**row))
+        else:
+            for col in COUNTER_COLUMNS:
+                setattr(stats, col, (getattr(stats, col) or 0) + row[col])
+            stats.updated_at = now
+    db.flush()
+
+def bump_academic_stats(db: Session, student_id: int, subject_id: Optional[int], **deltas) -> None:
+    """
+    Add the given counter deltas to the per-subject and overall stats rows.
+    Runs inside the caller's transaction; nothing is committed here.
+    """
+    totals: Dict[tuple, Dict[str, Any]] = {}
+    accumulate_deltas(totals, student_id, subject_id, **deltas)
+    apply_stat_deltas(db, totals)
+
+def get_overall_stats(db: Session, student_ids: List[int]) -> Dict[int, StudentAcademicStats]:
+    """Fetch the overall stats row for each of the given students in one query."""
+    if not student_ids:
+        return {}
+    rows = db.query(StudentAcademicStats).filter(
+        StudentAcademicStats.student_id.in_(student_ids),
+        StudentAcademicStats.subject_id == OVERALL_SUBJECT_ID
+    ).all()
+    return {row.student_id: row for row in rows}
+
+def stats_to_averages(stats: StudentAcademicStats) -> Dict[str, float]:
+    """Turn a stats row into the averages used by the scoring services."""
+    return {
+        "avg_marks": stats.marks_sum / stats.marks_count if stats.marks_count else 0,
+        "attendance_pct": (stats.attendance_present / stats.attendance_total * 100) if stats.attendance_total else 0,
+        "lab_avg": stats.lab_sum / stats.lab_count if stats.lab_count else 0,
+    }
+
+def aggregate_raw_history(db: Session, student_ids: Optional[List[int]] = None) -> Dict[tuple, Dict[str, Any]]:
+    """
+    Stats counters computed from raw attendance, marks and lab history, keyed
+    like accumulate_deltas: (student_id, subject_id) plus (student_id,
+    OVERALL_SUBJECT_ID). One grouped query per table.
+    """
+    totals: Dict[tuple, Dict[str, Any]] = {}
+
+    def scoped(query, model):
+        if student_ids is not None:
+            query = query.filter(model.student_id.in_(student_ids))
+        return query.group_by(model.student_id, model.subject_id)
+
+    attendance_rows = scoped(db.query(
+        AttendanceRecord.student_id,
+        AttendanceRecord.subject_id,
+        func.sum(case((AttendanceRecord.status == True, 1), else_=0)).label("present"),
+        func.count(AttendanceRecord.id).label("total")
+    ), AttendanceRecord)
+    for row in attendance_rows:
+        accumulate_deltas(totals, row.student_id, row.subject_id, attendance_present=row.present, attendance_total=row.total)
+
+    mark_rows = scoped(db.query(
+        Mark.student_id,
+        Mark.subject_id,
+        func.sum(Mark.score).label("total"),
+        func.count(Mark.score).label("count")
+    ), Mark)
+    for row in mark_rows:
+        accumulate_deltas(totals, row.student_id, row.subject_id, marks_sum=float(row.total or 0), marks_count=row.count)
+
+    lab_rows = scoped(db.query(
+        LabPerformance.student_id,
+        LabPerformance.subject_id,
+        func.sum(LabPerformance.score).label("total"),
+        func.count(LabPerformance.score).label("count")
+    ), LabPerformance)
+    for row in lab_rows:
+        accumulate_deltas(totals, row.student_id, row.subject_id, lab_sum=float(row.total or 0), lab_count=row.count)
+
+    return totals
+
+def rebuild_academic_stats(db: Session, student_ids: Optional[List[int]] = None) -> int:
+    """
+    Recompute stats rows from raw attendance, marks and lab history.
+    Used for backfills and to repair drift; rebuilds everyone unless
+    student_ids is given. Returns the number of stats rows written.
+
+    Concurrent bumps wait for the rebuild's transaction (see
+    lock_student_stats). The old rows are deleted before the raw history is
+    read, which on SQLite takes the write lock before anything is counted.
+    """
+    lock_student_stats(db, student_ids)
+    delete_query = db.query(StudentAcademicStats)
+    if student_ids is not None:
+        delete_query = delete_query.filter(StudentAcademicStats.student_id.in_(student_ids))
+    delete_query.delete(synchronize_session=False)
+
+    totals = aggregate_raw_history(db, student_ids)
+    now = datetime.utcnow()
+    rows = [
+        {"student_id": student_id, "subject_id": subject_id, **counters, "updated_at": now}
+        for (student_id, subject_id), counters in totals.items()
+        if student_id is not None
+    ]
+    for start in range(0, len(rows), STATS_BATCH_SIZE):
+        db.execute(insert(StudentAcademicStats), rows[start:start + STATS_BATCH_SIZE])
+    return len(rows)
+
+def find_students_missing_stats(db: Session, student_ids: Optional[List[int]] = None) -> List[int]:
+    """Students with raw attendance, marks or lab history but no overall stats row."""
+    missing = set()
+    for model in (AttendanceRecord, Mark, LabPerformance):
+        has_stats = exists().where(and_(
+            StudentAcademicStats.student_id == model.student_id,
+            StudentAcademicStats.subject_id == OVERALL_SUBJECT_ID
+        ))
+        query = db.query(model.student_id).filter(model.student_id.isnot(None), ~has_stats)
+        if student_ids is not None:
+            query = query.filter(model.student_id.in_(student_ids))
+        missing.update(row.student_id for row in query.distinct())
+    return sorted(missing)
+
+def rebuild_stats_in_batches(db: Session, student_ids: Optional[List[int]] = None, batch_size: int = REBUILD_STUDENT_BATCH_SIZE) -> int:
+    """
+    Rebuild stats rows for the given students (every student when None),
+    committing every batch_size students so no transaction holds locks for
+    the whole run. Returns the number of students processed.
+    """
+    if student_ids is None:
+        student_ids = [row.id for row in db.query(Student.id).order_by(Student.id)]
+    for start in range(0, len(student_ids), batch_size):
+        rebuild_academic_stats(db, student_ids[start:start + batch_size])
+        db.commit()
+    return len(student_ids)
@@ -1,5 +1,17 @@
 # Fallback ML Predictor (No Scikit-learn required for MVP)
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to the scalar path
+    np = None
+
+FEATURE_NAMES = (
+    "weekly_attendance_trend",
+    "marks_decline_trend",
+    "lab_submission_delays",
+    "high_attendance_low_marks"
+)
 
 class BurnoutPredictor:
     def __init__(self):
@@ -39,4 +51,46 @@ class BurnoutPredictor:
             "warning_level": "High" if probability > 70 else "Medium" if probability > 40 else "Low"
         }
 
+    def predict_batch(self, features: Dict[str, List[float]]) -> Dict[str, List[Any]]:
+        """
+        Column-oriented variant of predict for whole cohorts: one list per
+        feature, outputs in the same order. Rounding goes through Python's
+        round() so every probability matches the scalar heuristic exactly.
+        """
+        columns = [features.get(name, []) for name in FEATURE_NAMES]
+        size = max(len(column) for column in columns)
+        columns = [column or [0] * size for column in columns]
+        if len({len(column) for column in columns}) > 1:
+            raise ValueError("All feature columns must have the same length")
+
+        if np is None:
+            results = [self.predict(dict(zip(FEATURE_NAMES, row))) for row in zip(*columns)]
+            return {
+                "burnout_probabilities": [r["burnout_probability"] for r in results],
+                "burnout_risk_flags": [r["burnout_risk_flag"] for r in results],
+                "warning_levels": [r["warning_level"] for r in results]
+            }
+
+        attendance_trend, marks_trend, delays, high_att_low_marks = (
+            np.asarray(column, dtype=np.float64) for column in columns
+        )
+        # Same terms and summation order as the scalar heuristic
+        risk_scores = (
+            np.zeros(size) +
+            np.where(attendance_trend < 0, np.abs(attendance_trend) * 30, 0) +
+            np.where(marks_trend < 0, np.abs(marks_trend) * 30, 0) +
+            np.fmin(40, delays * 5) +
+            np.where(high_att_low_marks != 0, 20, 0)
+        )
+        probabilities = np.fmin(100.0, np.fmax(0.0, risk_scores))
+
+        return {
+            "burnout_probabilities": [round(p, 2) for p in probabilities.tolist()],
+            "burnout_risk_flags": (probabilities > 50).tolist(),
+            "warning_levels": np.where(
+                probabilities > 70, "High",
+                np.where(probabilities > 40, "Medium", "Low")
+            ).tolist()
+        }
+
 predictor = BurnoutPredictor()
@@ -0,0 +1,177 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import Float, case, cast, func, select
+from sqlalchemy.orm import Session
+from app.models import AttendanceRecord, LabPerformance, Mark, Student
+from app.services.burnout import FEATURE_NAMES, predictor
+from app.services.readiness_trend import truncate_datetime
+
+ATTENDANCE_WINDOW_WEEKS = 8
+# Exam types in the order they happen during a term; unknown types count as mid-term
+EXAM_STAGES = {"Assignment": 1, "Midterm": 2, "Final": 3}
+DEFAULT_EXAM_STAGE = 2
+HIGH_ATTENDANCE_PCT = 75.0
+LOW_MARKS_PCT = 50.0
+# Labs have no due dates; a lab scored under this share of max_score counts as a late/missed submission
+LAB_DELAY_SCORE_PCT = 40.0
+
+def _fitted_change(n, sum_x, sum_y, sum_xy, sum_xx, span) -> float:
+    """Least-squares slope times the x span: the trend's total change across the window."""
+    if not n or n < 2:
+        return 0.0
+    denominator = n * sum_xx - sum_x * sum_x
+    if not denominator:
+        return 0.0
+    return round((n * sum_xy - sum_x * sum_y) / denominator * span, 4)
+
+def _feature_query(db: Session, window_start: datetime, student_ids: Optional[List[int]], current_year: Optional[int]):
+    def scoped(query, model):
+        if student_ids is not None:
+            query = query.where(model.student_id.in_(student_ids))
+        if current_year is not None:
+            query = query.where(model.student_id.in_(select(Student.id).where(Student.current_year == current_year)))
+        return query
+
+    # Weekly attendance rate per student, numbered week 1..n with a window function
+    week = truncate_datetime(db, "week", AttendanceRecord.date)
+    weekly = scoped(
+        select(
+            AttendanceRecord.student_id,
+            week.label("week"),
+            func.sum(case((AttendanceRecord.status.is_(True), 1), else_=0)).label("present"),
+            func.count().label("total")
+        ).where(AttendanceRecord.date >= window_start),
+        AttendanceRecord
+    ).group_by(AttendanceRecord.student_id, week).cte("weekly_attendance")
+    ranked_weeks = select(
+        weekly.c.student_id,
+        weekly.c.present,
+        weekly.c.total,
+        (cast(weekly.c.present, Float) / weekly.c.total).label("rate"),
+        func.dense_rank().over(partition_by=weekly.c.student_id, order_by=weekly.c.week).label("x")
+    ).cte("ranked_weeks")
+    attendance = select(
+        ranked_weeks.c.student_id,
+        func.count().label("att_n"),
+        func.sum(ranked_weeks.c.x).label("att_sx"),
+        func.sum(ranked_weeks.c.rate).label("att_sy"),
+        func.sum(ranked_weeks.c.x * ranked_weeks.c.rate).label("att_sxy"),
+        func.sum(ranked_weeks.c.x * ranked_weeks.c.x).label("att_sxx"),
+        func.sum(ranked_weeks.c.present).label("att_present"),
+        func.sum(ranked_weeks.c.total).label("att_total")
+    ).group_by(ranked_weeks.c.student_id).subquery("attendance")
+
+    # Average mark percentage per exam stage, then the trend across stages
+    stage = case(
+        *[(Mark.exam_type == name, order) for name, order in EXAM_STAGES.items()],
+        else_=DEFAULT_EXAM_STAGE
+    )
+    pct = cast(Mark.score, Float) / Mark.max_score
+    stages = scoped(
+        select(
+            Mark.student_id,
+            stage.label("x"),
+            func.avg(pct).label("pct"),
+            func.sum(pct).label("pct_sum"),
+            func.count().label("n")
+        ).where(Mark.max_score > 0),
+        Mark
+    ).group_by(Mark.student_id, stage).cte("mark_stages")
+    marks = select(
+        stages.c.student_id,
+        func.count().label("mk_n"),
+        func.sum(stages.c.x).label("mk_sx"),
+        func.sum(stages.c.pct).label("mk_sy"),
+        func.sum(stages.c.x * stages.c.pct).label("mk_sxy"),
+        func.sum(stages.c.x * stages.c.x).label("mk_sxx"),
+        (func.max(stages.c.x) - func.min(stages.c.x)).label("mk_span"),
+        (func.sum(stages.c.pct_sum) / func.sum(stages.c.n)).label("mk_avg")
+    ).group_by(stages.c.student_id).subquery("marks")
+
+    labs = scoped(
+        select(
+            LabPerformance.student_id,
+            func.sum(case(
+                (LabPerformance.score < LabPerformance.max_score * (LAB_DELAY_SCORE_PCT / 100), 1),
+                else_=0
+            )).label("lab_delays")
+        ).where(LabPerformance.max_score > 0),
+        LabPerformance
+    ).group_by(LabPerformance.student_id).subquery("labs")
+
+    query = (
+        select(Student.id, Student.name, Student.roll_number, Student.current_year, attendance, marks, labs.c.lab_delays)
+        .outerjoin(attendance, attendance.c.student_id == Student.id)
+        .outerjoin(marks, marks.c.student_id == Student.id)
+        .outerjoin(labs, labs.c.student_id == Student.id)
+    )
+    if student_ids is not None:
+        query = query.where(Student.id.in_(student_ids))
+    if current_year is not None:
+        query = query.where(Student.current_year == current_year)
+    return query.order_by(Student.id)
+
+def derive_burnout_features(
+    db: Session,
+    student_ids: Optional[List[int]] = None,
+    current_year: Optional[int] = None,
+    now: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Burnout features for a cohort, from one aggregate query:
+    - weekly_attendance_trend: fitted change in weekly attendance rate over
+      the last ATTENDANCE_WINDOW_WEEKS weeks (-1..1)
+    - marks_decline_trend: fitted change in mark percentage across exam
+      stages (Assignment -> Midterm -> Final, -1..1)
+    - lab_submission_delays: labs scored under LAB_DELAY_SCORE_PCT
+    - high_attendance_low_marks: 1 when attendance is high but marks are low
+    Students without data get neutral (zero) features.
+    """
+    now = now or datetime.utcnow()
+    window_start = now - timedelta(weeks=ATTENDANCE_WINDOW_WEEKS)
+    rows = db.execute(_feature_query(db, window_start, student_ids, current_year)).all()
+
+    cohort = []
+    for row in rows:
+        attendance_pct = (row.att_present / row.att_total * 100) if row.att_total else None
+        marks_pct = row.mk_avg * 100 if row.mk_avg is not None else None
+        cohort.append({
+            "student_id": row.id,
+            "name": row.name,
+            "roll_number": row.roll_number,
+            "current_year": row.current_year,
+            "weekly_attendance_trend": _fitted_change(
+                row.att_n, row.att_sx, row.att_sy, row.att_sxy, row.att_sxx, (row.att_n or 1) - 1
+            ),
+            "marks_decline_trend": _fitted_change(
+                row.mk_n, row.mk_sx, row.mk_sy, row.mk_sxy, row.mk_sxx, row.mk_span
+            ),
+            "lab_submission_delays": int(row.lab_delays or 0),
+            "high_attendance_low_marks": int(
+                attendance_pct is not None and marks_pct is not None
+                and attendance_pct >= HIGH_ATTENDANCE_PCT and marks_pct < LOW_MARKS_PCT
+            )
+        })
+    return cohort
+
+def score_cohort_burnout(
+    db: Session,
+    student_ids: Optional[List[int]] = None,
+    current_year: Optional[int] = None,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Derive features and score the whole cohort in one vectorized pass, highest risk first."""
+    cohort = derive_burnout_features(db, student_ids=student_ids, current_year=current_year)
+    if not cohort:
+        return []
+    scores = predictor.predict_batch({
+        name: [student[name] for student in cohort]
+        for name in FEATURE_NAMES
+    })
+    for student, probability, flag, level in zip(
+        cohort, scores["burnout_probabilities"], scores["burnout_risk_flags"], scores["warning_levels"]
+    ):
+        student.update(burnout_probability=probability, burnout_risk_flag=flag, warning_level=level)
+
+    cohort.sort(key=lambda student: (-student["burnout_probability"], student["student_id"]))
+    return cohort[:limit] if limit else cohort
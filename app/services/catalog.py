@@ -0,0 +1,217 @@
+import json
+import os
+from typing import Any, Dict, List, Sequence, Tuple
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.core.cache import invalidate_after_commit
+from app.models import IndustryRole, RoleSkillMapping, Skill, Subject, SubjectIndustryMapping
+from app.services.roadmap import roadmap_cache
+from app.services.role_fit import role_skill_index
+
+try:
+    import yaml
+except ImportError:  # YAML catalogs are optional; JSON always works
+    yaml = None
+
+CATALOG_BATCH_SIZE = 500
+SKILL_FIELDS = ("academic_year", "description")
+JSON_COLUMNS = ("projects", "tools")
+
+def load_catalog_file(path: str) -> List[Dict[str, Any]]:
+    """
+    Read a catalog from .json, .yaml or .yml: a list of subject entries (or
+    {"subjects": [...]}), each shaped like
+
+        {"subject_name": ..., "subject_code": ..., "credits": ...,
+         "industry_roles": [{"title": ..., "average_salary": ...,
+                             "required_skills": [name or {"name", "academic_year", "description"}],
+                             "tools_used": [...], "projects": [...]}]}
+    """
+    with open(path, encoding="utf-8") as f:
+        if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+            if yaml is None:
+                raise ValueError("YAML catalogs need PyYAML installed (pip install pyyaml); use JSON instead")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("subjects")
+    if not isinstance(data, list):
+        raise ValueError("Catalog must be a list of subjects or {\"subjects\": [...]}")
+    return data
+
+def _comparable(column: str, value: Any) -> Any:
+    # projects/tools are JSONB on Postgres (decoded by the driver) and TEXT elsewhere
+    if column in JSON_COLUMNS and isinstance(value, str):
+        return json.loads(value)
+    return value
+
+def normalize_catalog(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Flatten catalog entries into rows per table, keyed by natural key. A role
+    listed under several subjects gets the union of their skills; for any
+    other repeated key the last entry wins.
+    """
+    subjects, roles, skills = {}, {}, {}
+    role_skills, subject_roles = set(), {}
+    for index, entry in enumerate(entries):
+        try:
+            code = entry["subject_code"]
+            subjects[code] = {"code": code, "name": entry["subject_name"], "credits": entry["credits"]}
+            for role in entry.get("industry_roles", []):
+                title = role["title"]
+                roles[title] = {"title": title, "average_salary": role.get("average_salary")}
+                for skill in role.get("required_skills", []):
+                    if isinstance(skill, str):
+                        skill = {"name": skill}
+                    # Fields the catalog leaves out are not overwritten
+                    row = skills.setdefault(skill["name"], {"name": skill["name"]})
+                    row.update({field: skill[field] for field in SKILL_FIELDS if field in skill})
+                    role_skills.add((title, skill["name"]))
+                subject_roles[(code, title)] = {
+                    "projects": role.get("projects", []),
+                    "tools": role.get("tools_used", [])
+                }
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Catalog entry {index}: missing or malformed field {e}")
+    return {
+        "subjects": list(subjects.values()),
+        "roles": list(roles.values()),
+        "skills": list(skills.values()),
+        "role_skills": sorted(role_skills),
+        "subject_roles": subject_roles,
+    }
+
+def _upsert_statement(db: Session, model):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    return None
+
+def _existing_rows(db: Session, model, key_columns: Sequence[str], columns: Sequence[str], keys: List[tuple]) -> Dict[tuple, Any]:
+    """Current rows for the given natural keys, one IN query per batch on the first key column."""
+    lead = getattr(model, key_columns[0])
+    wanted = set(keys)
+    first_values = sorted({key[0] for key in keys})
+    found = {}
+    for start in range(0, len(first_values), CATALOG_BATCH_SIZE):
+        rows = db.execute(
+            select(*(getattr(model, col) for col in columns)).where(lead.in_(first_values[start:start + CATALOG_BATCH_SIZE]))
+        ).all()
+        for row in rows:
+            key = tuple(getattr(row, col) for col in key_columns)
+            if key in wanted:
+                found[key] = row
+    return found
+
+def _sync_table(db: Session, model, key_columns: Sequence[str], rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Bring `rows` into `model`'s table: new keys are inserted with INSERT ...
+    ON CONFLICT (so a concurrent loader cannot make the load fail), changed
+    rows are updated by primary key in one executemany per batch, and rows
+    that already match are left alone.
+    """
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    if not rows:
+        return counts
+    pk_columns = [column.name for column in model.__table__.primary_key.columns]
+    value_columns = sorted({col for row in rows for col in row} - set(key_columns))
+    existing = _existing_rows(
+        db, model, key_columns, list(dict.fromkeys([*pk_columns, *key_columns, *value_columns])),
+        [tuple(row[col] for col in key_columns) for row in rows]
+    )
+
+    inserts, updates = [], []
+    for row in rows:
+        current = existing.get(tuple(row[col] for col in key_columns))
+        if current is None:
+            inserts.append(row)
+            continue
+        changed = {
+            col: row[col] for col in value_columns
+            if col in row and _comparable(col, getattr(current, col)) != _comparable(col, row[col])
+        }
+        if changed:
+            updates.append({**{col: getattr(current, col) for col in pk_columns}, **changed})
+        else:
+            counts["unchanged"] += 1
+
+    # Multi-row VALUES need the same columns in every row
+    insert_groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for row in inserts:
+        insert_groups.setdefault(tuple(sorted(row)), []).append(row)
+    for columns, group in insert_groups.items():
+        for start in range(0, len(group), CATALOG_BATCH_SIZE):
+            chunk = group[start:start + CATALOG_BATCH_SIZE]
+            stmt = _upsert_statement(db, model)
+            if stmt is None:
+                db.execute(insert(model), chunk)
+                continue
+            stmt = stmt.values(chunk)
+            set_columns = [col for col in columns if col not in key_columns]
+            if set_columns:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=list(key_columns),
+                    set_={col: stmt.excluded[col] for col in set_columns}
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=list(key_columns))
+            db.execute(stmt)
+
+    # Updates differ in which columns changed; group them the same way
+    update_groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for row in updates:
+        update_groups.setdefault(tuple(sorted(row)), []).append(row)
+    for group in update_groups.values():
+        for start in range(0, len(group), CATALOG_BATCH_SIZE):
+            # ORM bulk UPDATE by primary key: one executemany per chunk
+            db.execute(update(model), group[start:start + CATALOG_BATCH_SIZE])
+
+    counts["inserted"] = len(inserts)
+    counts["updated"] = len(updates)
+    return counts
+
+def _id_map(db: Session, model, key_column: str, keys: List[str]) -> Dict[str, int]:
+    column = getattr(model, key_column)
+    ids = {}
+    for start in range(0, len(keys), CATALOG_BATCH_SIZE):
+        ids.update(db.execute(select(column, model.id).where(column.in_(keys[start:start + CATALOG_BATCH_SIZE]))).all())
+    return ids
+
+def upsert_catalog(db: Session, entries: List[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """
+    Idempotently load a subject -> role -> skill catalog. Ids are resolved
+    with set-based lookups and every table is written in batched statements,
+    so the number of round trips grows with the batch count, not the catalog
+    size. Runs inside the caller's transaction; nothing is committed here.
+    The Core/bulk writes skip the ORM invalidation hooks, so the roadmap and
+    role-fit caches are invalidated here once the caller commits.
+    Returns inserted/updated/unchanged counts per table.
+    """
+    catalog = normalize_catalog(entries)
+    report = {
+        "subjects": _sync_table(db, Subject, ("code",), catalog["subjects"]),
+        "industry_roles": _sync_table(db, IndustryRole, ("title",), catalog["roles"]),
+        "skills": _sync_table(db, Skill, ("name",), catalog["skills"]),
+    }
+
+    subject_ids = _id_map(db, Subject, "code", [row["code"] for row in catalog["subjects"]])
+    role_ids = _id_map(db, IndustryRole, "title", [row["title"] for row in catalog["roles"]])
+    skill_ids = _id_map(db, Skill, "name", [row["name"] for row in catalog["skills"]])
+
+    report["role_skill_mapping"] = _sync_table(db, RoleSkillMapping, ("role_id", "skill_id"), [
+        {"role_id": role_ids[title], "skill_id": skill_ids[name]}
+        for title, name in catalog["role_skills"]
+    ])
+    report["subject_industry_mapping"] = _sync_table(db, SubjectIndustryMapping, ("subject_id", "role_id"), [
+        {
+            "subject_id": subject_ids[code], "role_id": role_ids[title],
+            "projects": json.dumps(mapping["projects"]), "tools": json.dumps(mapping["tools"])
+        }
+        for (code, title), mapping in catalog["subject_roles"].items()
+    ])
+    invalidate_after_commit(db, roadmap_cache, role_skill_index)
+    return report
@@ -0,0 +1,60 @@
+import json
+from typing import Any, Dict, Optional
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache, invalidate_on_commit
+from app.core.config import settings
+from app.core.http_cache import make_etag
+from app.models import Student, ReadinessScore, PlacementPrediction
+
+# student_id -> {"etag": str, "body": bytes}. Entries are dropped when a
+# change to the student, their readiness score or placement prediction
+# commits in this process; other workers serve theirs for up to
+# DASHBOARD_CACHE_TTL_SECONDS.
+dashboard_cache = TTLCache(settings.DASHBOARD_CACHE_TTL_SECONDS, settings.DASHBOARD_CACHE_MAX_SIZE)
+
+def _columns(obj: Any) -> Optional[Dict[str, Any]]:
+    if obj is None:
+        return None
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+def render_dashboard_summary(db: Session, student_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Load the student with their readiness score and placement prediction in a
+    single outer-joined query and render the summary as JSON bytes plus ETag.
+    Returns None when the student does not exist.
+    """
+    cached = dashboard_cache.get(student_id)
+    if cached is not None:
+        return cached
+    generation = dashboard_cache.generation
+
+    row = (
+        db.query(Student, ReadinessScore, PlacementPrediction)
+        .outerjoin(ReadinessScore, ReadinessScore.student_id == Student.id)
+        .outerjoin(PlacementPrediction, PlacementPrediction.student_id == Student.id)
+        .filter(Student.id == student_id)
+        .first()
+    )
+    if row is None:
+        return None
+    student, readiness, placement = row
+
+    summary = {
+        "student": {
+            "id": student.id,
+            "name": student.name,
+            "roll_number": student.roll_number,
+            "email": student.email
+        },
+        "readiness": _columns(readiness),
+        "placement": _columns(placement)
+    }
+    body = json.dumps(jsonable_encoder(summary)).encode("utf-8")
+    rendered = {"etag": make_etag("dashboard", body), "body": body}
+    dashboard_cache.set(student_id, rendered, generation=generation)
+    return rendered
+
+invalidate_on_commit(dashboard_cache, ReadinessScore, PlacementPrediction, key=lambda target: target.student_id)
+invalidate_on_commit(dashboard_cache, Student, key=lambda target: target.id, events=("after_update", "after_delete"))
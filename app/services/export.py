@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, Optional
+from sqlalchemy import and_, select
+from app.database import SessionLocal
+from app.models import PlacementPrediction, ReadinessScore, Student, StudentAcademicStats
+from app.services.academic_stats import COUNTER_COLUMNS, OVERALL_SUBJECT_ID, aggregate_raw_history, stats_to_averages
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = (
+    "student_id", "roll_number", "name", "email", "current_year", "created_at",
+    "attendance_pct", "avg_marks", "lab_avg",
+    "readiness_score", "risk_level", "placement_probability"
+)
+
+def _cohort_query(current_year: Optional[int]):
+    query = (
+        select(
+            Student.id, Student.roll_number, Student.name, Student.email, Student.current_year, Student.created_at,
+            StudentAcademicStats.student_id.label("stats_student_id"),
+            StudentAcademicStats.attendance_present, StudentAcademicStats.attendance_total,
+            StudentAcademicStats.marks_sum, StudentAcademicStats.marks_count,
+            StudentAcademicStats.lab_sum, StudentAcademicStats.lab_count,
+            ReadinessScore.score.label("readiness_score"), ReadinessScore.risk_level,
+            PlacementPrediction.probability.label("placement_probability")
+        )
+        .outerjoin(StudentAcademicStats, and_(
+            StudentAcademicStats.student_id == Student.id,
+            StudentAcademicStats.subject_id == OVERALL_SUBJECT_ID
+        ))
+        .outerjoin(ReadinessScore, ReadinessScore.student_id == Student.id)
+        .outerjoin(PlacementPrediction, PlacementPrediction.student_id == Student.id)
+    )
+    if current_year is not None:
+        query = query.where(Student.current_year == current_year)
+    return query.order_by(Student.id)
+
+def _raw_averages(db, student_ids) -> Dict[int, Dict[str, float]]:
+    """Averages from raw history for students whose stats row does not exist yet."""
+    if not student_ids:
+        return {}
+    totals = aggregate_raw_history(db, student_ids)
+    return {
+        student_id: stats_to_averages(SimpleNamespace(**counters))
+        for (student_id, subject_id), counters in totals.items()
+        if subject_id == OVERALL_SUBJECT_ID
+    }
+
+def iter_cohort_rows(current_year: Optional[int] = None, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Yield one analytics dict per student. Rows come off a server-side cursor
+    (yield_per) in batches, so memory stays flat regardless of cohort size.
+    Students without a stats row are averaged from their raw history, with
+    one grouped query per table per batch, so their export is not zeros.
+    Opens its own session: it outlives the request handler while streaming.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(_cohort_query(current_year).execution_options(yield_per=batch_size))
+        for batch in result.partitions():
+            fallback = _raw_averages(db, [row.id for row in batch if row.stats_student_id is None])
+            for row in batch:
+                if row.stats_student_id is None:
+                    averages = fallback.get(row.id) or stats_to_averages(SimpleNamespace(**dict.fromkeys(COUNTER_COLUMNS, 0)))
+                else:
+                    averages = stats_to_averages(row)
+                yield {
+                    "student_id": row.id,
+                    "roll_number": row.roll_number,
+                    "name": row.name,
+                    "email": row.email,
+                    "current_year": row.current_year,
+                    "created_at": row.created_at.isoformat() if row.created_at else None,
+                    "attendance_pct": round(averages["attendance_pct"], 2),
+                    "avg_marks": round(averages["avg_marks"], 2),
+                    "lab_avg": round(averages["lab_avg"], 2),
+                    "readiness_score": row.readiness_score,
+                    "risk_level": row.risk_level,
+                    "placement_probability": row.placement_probability
+                }
+    finally:
+        db.close()
+
+def stream_csv(rows: Iterator[Dict[str, Any]], chunk_rows: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """Encode rows as CSV: the header goes out at once, then chunk_rows rows per chunk."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+
+    def flush() -> bytes:
+        chunk = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    writer.writeheader()
+    yield flush()
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= chunk_rows:
+            yield flush()
+            pending = 0
+    if pending:
+        yield flush()
+
+def stream_ndjson(rows: Iterator[Dict[str, Any]], chunk_rows: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """Encode rows as newline-delimited JSON, chunk_rows rows per chunk."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row))
+        if len(lines) >= chunk_rows:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
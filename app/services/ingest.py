@@ -0,0 +1,228 @@
+import codecs
+import csv
+import json
+import re
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app import models, schemas
+from app.database import run_db
+from app.services.academic_stats import accumulate_deltas, apply_stat_deltas
+
+DEFAULT_BATCH_SIZE = 5000
+# Rejects are listed up to this many per response; the counts are always complete
+MAX_REJECTS_REPORTED = 100
+# A quoted CSV field may span lines, but not without bound
+MAX_CSV_RECORD_CHARS = 1024 * 1024
+
+def _attendance_row(item: schemas.AttendanceCreate, now: datetime) -> Dict[str, Any]:
+    return {
+        "student_id": item.student_id,
+        "subject_id": item.subject_id,
+        "status": item.status,
+        "date": item.date or now,
+    }
+
+def _attendance_deltas(item: schemas.AttendanceCreate) -> Dict[str, Any]:
+    return {"attendance_present": 1 if item.status else 0, "attendance_total": 1}
+
+def _mark_row(item: schemas.MarkCreate, now: datetime) -> Dict[str, Any]:
+    return item.model_dump()
+
+def _mark_deltas(item: schemas.MarkCreate) -> Dict[str, Any]:
+    return {"marks_sum": item.score, "marks_count": 1}
+
+# kind -> (validation schema, table, row builder, stats deltas)
+INGEST_KINDS = {
+    "attendance": (schemas.AttendanceCreate, models.AttendanceRecord, _attendance_row, _attendance_deltas),
+    "marks": (schemas.MarkCreate, models.Mark, _mark_row, _mark_deltas),
+}
+
+# Line breaks as the csv module sees them. A "\r" at the end of the buffer is
+# held back until the next chunk shows whether a "\n" follows it.
+_LINE_BREAK = re.compile(r"\r\n|\r(?!\Z)|\n")
+_FINAL_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+def _split_lines(text: str, pattern: "re.Pattern") -> Tuple[List[str], str]:
+    """Complete lines (with their line breaks) and the trailing partial line."""
+    lines, start = [], 0
+    for match in pattern.finditer(text):
+        lines.append(text[start:match.end()])
+        start = match.end()
+    return lines, text[start:]
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into text lines, holding at most one partial line."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        lines, pending = _split_lines(pending + decoder.decode(chunk), _LINE_BREAK)
+        for line in lines:
+            yield line
+    lines, pending = _split_lines(pending + decoder.decode(b"", final=True), _FINAL_LINE_BREAK)
+    for line in lines:
+        yield line
+    if pending:
+        yield pending
+
+async def iter_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Yield (line_number, record) from a CSV (with header row) or NDJSON stream.
+    A CSV record spans several lines while a quoted field is open, and is
+    numbered by the line it starts on. Records that cannot be parsed are
+    yielded as ValueError instances so the caller can report them as rejects.
+    """
+    header = None
+    line_no = 0
+    # Lines of the CSV record being read, the line it started on and its size
+    record_lines: List[str] = []
+    record_start = 0
+    record_chars = 0
+    quotes = 0
+    async for line in _iter_lines(chunks):
+        line_no += 1
+        if fmt == "ndjson":
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("Expected a JSON object")
+            except ValueError as e:
+                yield line_no, ValueError(f"Invalid JSON: {e}")
+                continue
+            yield line_no, record
+            continue
+
+        if not record_lines:
+            if not line.strip():
+                continue
+            record_start = line_no
+        record_lines.append(line)
+        record_chars += len(line)
+        # Quotes inside a quoted field are doubled, so an odd count means one is still open
+        quotes += line.count('"')
+        if quotes % 2:
+            if record_chars > MAX_CSV_RECORD_CHARS:
+                # Almost certainly a stray quote; the rest of the stream cannot be delimited
+                yield record_start, ValueError("Unterminated quoted field; the rest of the file was not read")
+                return
+            continue
+        lines, record_lines, record_chars, quotes = record_lines, [], 0, 0
+        try:
+            values = next(csv.reader(lines))
+        except csv.Error as e:
+            yield record_start, ValueError(f"Invalid CSV: {e}")
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield record_start, ValueError(f"Expected {len(header)} columns, got {len(values)}")
+            continue
+        # Empty CSV cells mean "not provided"
+        yield record_start, {name: value for name, value in zip(header, values) if value != ""}
+
+    if record_lines:
+        yield record_start, ValueError("Unterminated quoted field")
+
+def _error_message(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first.get("loc", ()))
+    return f"{location}: {first['msg']}" if location else first["msg"]
+
+def ingest_batch(db: Session, kind: str, batch_no: int, records: List[Tuple[int, Any]]) -> Dict[str, Any]:
+    """
+    Validate one batch, insert the valid rows with a single executemany and
+    update student_academic_stats, all in one transaction.
+    """
+    schema, model, build_row, build_deltas = INGEST_KINDS[kind]
+    rejects = []
+    valid: List[Tuple[int, BaseModel]] = []
+    for line_no, record in records:
+        if isinstance(record, Exception):
+            rejects.append({"row": line_no, "error": str(record)})
+            continue
+        try:
+            valid.append((line_no, schema.model_validate(record)))
+        except ValidationError as e:
+            rejects.append({"row": line_no, "error": _error_message(e)})
+
+    # Reject unknown students/subjects up front instead of failing the whole batch on a FK error
+    if valid:
+        student_ids = {item.student_id for _, item in valid}
+        subject_ids = {item.subject_id for _, item in valid}
+        known_students = set(db.scalars(select(models.Student.id).where(models.Student.id.in_(student_ids))))
+        known_subjects = set(db.scalars(select(models.Subject.id).where(models.Subject.id.in_(subject_ids))))
+        checked: List[Tuple[int, BaseModel]] = []
+        for line_no, item in valid:
+            if item.student_id not in known_students:
+                rejects.append({"row": line_no, "error": f"student_id: Unknown student {item.student_id}"})
+            elif item.subject_id not in known_subjects:
+                rejects.append({"row": line_no, "error": f"subject_id: Unknown subject {item.subject_id}"})
+            else:
+                checked.append((line_no, item))
+        valid = checked
+
+    summary = {
+        "batch": batch_no,
+        "rows": len(records),
+        "inserted": 0,
+        "rejected": len(rejects),
+        "rejects": sorted(rejects, key=lambda r: r["row"])[:MAX_REJECTS_REPORTED],
+    }
+    if not valid:
+        return summary
+
+    now = datetime.utcnow()
+    totals: Dict[tuple, Dict[str, Any]] = {}
+    for _, item in valid:
+        accumulate_deltas(totals, item.student_id, item.subject_id, **build_deltas(item))
+    try:
+        db.execute(insert(model), [build_row(item, now) for _, item in valid])
+        apply_stat_deltas(db, totals)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        summary["rejected"] = len(records)
+        summary["error"] = f"Batch rolled back: {e.__class__.__name__}"
+        return summary
+
+    summary["inserted"] = len(valid)
+    return summary
+
+async def ingest_stream(db: Any, kind: str, chunks: AsyncIterator[bytes], fmt: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Consume an upload stream batch by batch. Only one batch is held in memory
+    at a time, and each batch commits on its own, so a bad row or batch never
+    rolls back work that was already accepted. The response has the totals
+    and the first MAX_REJECTS_REPORTED rejects and failed batches, so its size
+    does not grow with the upload.
+    """
+    batch: List[Tuple[int, Any]] = []
+    totals = {"batches": 0, "rows": 0, "inserted": 0, "rejected": 0}
+    rejects: List[Dict[str, Any]] = []
+    failed_batches: List[Dict[str, Any]] = []
+
+    async def flush():
+        totals["batches"] += 1
+        summary = await run_db(db, ingest_batch, kind, totals["batches"], batch)
+        for key in ("rows", "inserted", "rejected"):
+            totals[key] += summary[key]
+        if "error" in summary:
+            if len(failed_batches) < MAX_REJECTS_REPORTED:
+                failed_batches.append({"batch": summary["batch"], "rows": summary["rows"], "error": summary["error"]})
+        else:
+            rejects.extend(summary["rejects"][:MAX_REJECTS_REPORTED - len(rejects)])
+
+    async for record in iter_records(chunks, fmt):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            await flush()
+            batch = []
+    if batch:
+        await flush()
+
+    return {"kind": kind, "format": fmt, **totals, "rejects": rejects, "failed_batches": failed_batches}
@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.core.cache import DerivedCache, invalidate_on_commit
+from app.core.config import settings
+from app.models import CampusNotification
+from app import schemas
+
+def _as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # TIMESTAMPTZ columns come back tz-aware from Postgres; compare in naive UTC
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+class NotificationFeedCache(DerivedCache):
+    """
+    Active (non-expired) campus notifications kept in memory, newest first.
+
+    Expiry is re-checked on every read, so items drop out on time without a
+    reload. Committed ORM writes to campus_notifications trigger a reload, and
+    rows written by other processes show up within
+    NOTIFICATION_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        super().__init__("notification_feed", ttl_seconds)
+
+    def build(self, db: Session) -> List[Dict[str, Any]]:
+        now = datetime.utcnow()
+        rows = (
+            db.query(CampusNotification)
+            .filter(or_(CampusNotification.expires_at.is_(None), CampusNotification.expires_at > now))
+            .order_by(CampusNotification.created_at.desc(), CampusNotification.id.desc())
+            .all()
+        )
+        items = []
+        for row in rows:
+            item = schemas.CampusNotificationOut.model_validate(row).model_dump()
+            item["_expires_at"] = _as_naive_utc(row.expires_at)
+            items.append(item)
+        return items
+
+    def active(self, db: Session, since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Active notifications, optionally only those with id greater than `since`."""
+        items = self.get(db)
+        now = datetime.utcnow()
+        return [
+            {k: v for k, v in item.items() if k != "_expires_at"}
+            for item in items
+            if (item["_expires_at"] is None or item["_expires_at"] > now)
+            and (since is None or item["id"] > since)
+        ]
+
+notification_feed = NotificationFeedCache(settings.NOTIFICATION_CACHE_TTL_SECONDS)
+
+invalidate_on_commit(notification_feed, CampusNotification)
@@ -1,42 +1,22 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from sqlalchemy import func, case
 from sqlalchemy.orm import Session
 from app.models import Student, Mark, AttendanceRecord, LabPerformance
+from app.services.academic_stats import get_overall_stats, stats_to_averages
 
-def predict_placement_probability(
-    db: Session,
-    student_id: int,
-    # Manual overrides if needed for "What-if" analysis
-    override_skill_score: float = None,
-    override_projects: int = None
+def _score_placement(
+    avg_marks: float,
+    attendance_pct: float,
+    project_count: int,
+    skill_score: float
 ) -> Dict[str, Any]:
     """
-    ML-Ready Placement Probability Engine.
-    In a real production app, this would load a joblib/pkl model.
-    Here we implement the logic based on DB records.
+    Shared scoring step for the single-student and batch paths, so both
+    produce identical numbers for identical inputs.
     """
-    student = db.query(Student).filter(Student.id == student_id).first()
-    if not student:
-        return {"error": "Student not found"}
-
-    # 1. Calculate Core Subject Marks Average
-    marks = db.query(Mark).filter(Mark.student_id == student_id).all()
-    avg_marks = sum(m.score for m in marks) / len(marks) if marks else 0
-
-    # 2. Calculate Attendance Percentage
-    total_days = db.query(AttendanceRecord).filter(AttendanceRecord.student_id == student_id).count()
-    present_days = db.query(AttendanceRecord).filter(AttendanceRecord.student_id == student_id, AttendanceRecord.status == True).count()
-    attendance_pct = (present_days / total_days * 100) if total_days > 0 else 0
-
-    # 3. Project Count (Assuming a schema for projects or derived from Lab/Subject mapping)
-    # For now, we'll use the readiness score's project count if available
-    project_count = override_projects if override_projects is not None else 2 # Default fallback
-
     # 4. Logic representing an ML model (Linear Combination/Logistic approach)
     # Weights: Marks(0.3), Attendance(0.2), Projects(0.2), Communication(0.1), Skills(0.2)
     # In practice: probability = 1 / (1 + exp(-(beta0 + beta1*marks + ...)))
-    
-    skill_score = override_skill_score if override_skill_score is not None else 70.0
-    
     probability = (
         (avg_marks * 0.35) + 
         (attendance_pct * 0.15) + 
@@ -64,3 +44,124 @@ def predict_placement_probability(
             "projects": project_count
         }
     }
+
+def _raw_averages(db: Session, student_ids: List[int]) -> Dict[str, Dict[int, float]]:
+    """
+    Marks averages and attendance percentages from raw history, for students
+    without a stats row yet: one GROUP BY query per table for all of them.
+    """
+    marks_rows = (
+        db.query(Mark.student_id, func.avg(Mark.score).label("avg_marks"))
+        .filter(Mark.student_id.in_(student_ids))
+        .group_by(Mark.student_id)
+        .all()
+    )
+    attendance_rows = (
+        db.query(
+            AttendanceRecord.student_id,
+            func.count(AttendanceRecord.id).label("total_days"),
+            func.sum(case((AttendanceRecord.status == True, 1), else_=0)).label("present_days")
+        )
+        .filter(AttendanceRecord.student_id.in_(student_ids))
+        .group_by(AttendanceRecord.student_id)
+        .all()
+    )
+    return {
+        "avg_marks": {row.student_id: float(row.avg_marks) for row in marks_rows},
+        "attendance_pct": {
+            row.student_id: (row.present_days / row.total_days * 100) if row.total_days > 0 else 0
+            for row in attendance_rows
+        },
+    }
+
+def predict_placement_probability(
+    db: Session,
+    student_id: int,
+    # Manual overrides if needed for "What-if" analysis
+    override_skill_score: float = None,
+    override_projects: int = None
+) -> Dict[str, Any]:
+    """
+    ML-Ready Placement Probability Engine.
+    In a real production app, this would load a joblib/pkl model.
+    Here we implement the logic based on DB records.
+    """
+    student = db.query(Student).filter(Student.id == student_id).first()
+    if not student:
+        return {"error": "Student not found"}
+
+    stats = get_overall_stats(db, [student_id]).get(student_id)
+    if stats is not None:
+        # 1 & 2. Marks average and attendance from the maintained stats row
+        averages = stats_to_averages(stats)
+        avg_marks = averages["avg_marks"]
+        attendance_pct = averages["attendance_pct"]
+    else:
+        # Not backfilled yet: aggregate raw history
+        raw = _raw_averages(db, [student_id])
+        avg_marks = raw["avg_marks"].get(student_id, 0)
+        attendance_pct = raw["attendance_pct"].get(student_id, 0)
+
+    # 3. Project Count (Assuming a schema for projects or derived from Lab/Subject mapping)
+    # For now, we'll use the readiness score's project count if available
+    project_count = override_projects if override_projects is not None else 2 # Default fallback
+
+    skill_score = override_skill_score if override_skill_score is not None else 70.0
+
+    return _score_placement(avg_marks, attendance_pct, project_count, skill_score)
+
+def predict_placement_batch(
+    db: Session,
+    student_ids: Optional[List[int]] = None,
+    current_year: Optional[int] = None,
+    override_skill_score: float = None,
+    override_projects: int = None
+) -> List[Dict[str, Any]]:
+    """
+    Cohort-wide variant of predict_placement_probability.
+    Marks averages and attendance percentages come from the maintained
+    student_academic_stats rows; students not backfilled yet are covered by
+    one GROUP BY query each instead of four queries per student.
+    Requested ids that do not exist come back with an "error" entry.
+    """
+    student_query = db.query(Student.id)
+    if student_ids is not None:
+        student_query = student_query.filter(Student.id.in_(student_ids))
+    if current_year is not None:
+        student_query = student_query.filter(Student.current_year == current_year)
+    found_ids = [row.id for row in student_query.order_by(Student.id).all()]
+
+    marks_by_student: Dict[int, float] = {}
+    attendance_by_student: Dict[int, float] = {}
+    for student_id, stats in get_overall_stats(db, found_ids).items():
+        averages = stats_to_averages(stats)
+        marks_by_student[student_id] = averages["avg_marks"]
+        attendance_by_student[student_id] = averages["attendance_pct"]
+
+    # Students without a stats row yet fall back to grouped raw aggregates
+    missing_ids = [student_id for student_id in found_ids if student_id not in marks_by_student]
+    if missing_ids:
+        raw = _raw_averages(db, missing_ids)
+        marks_by_student.update(raw["avg_marks"])
+        attendance_by_student.update(raw["attendance_pct"])
+
+    project_count = override_projects if override_projects is not None else 2 # Default fallback
+    skill_score = override_skill_score if override_skill_score is not None else 70.0
+
+    results = []
+    for student_id in found_ids:
+        result = _score_placement(
+            marks_by_student.get(student_id, 0),
+            attendance_by_student.get(student_id, 0),
+            project_count,
+            skill_score
+        )
+        results.append({"student_id": student_id, **result})
+
+    if student_ids is not None and current_year is None:
+        found = set(found_ids)
+        for student_id in dict.fromkeys(student_ids):
+            if student_id not in found:
+                results.append({"student_id": student_id, "error": "Student not found"})
+
+    return results
@@ -0,0 +1,143 @@
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import or_, func
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models import ReadinessScore, ReadinessHistory, StudentAcademicStats
+from app.services.academic_stats import (
+    OVERALL_SUBJECT_ID, find_students_missing_stats, get_overall_stats, rebuild_stats_in_batches, stats_to_averages
+)
+from app.services.scoring import calculate_readiness_scores_batch
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+# No per-student skill or project data yet; same fallbacks as the placement engine
+DEFAULT_SKILL_COVERAGE_PCT = 70.0
+DEFAULT_PROJECT_COUNT = 2
+
+def find_stale_students(db: Session, student_ids: Optional[List[int]] = None) -> List[int]:
+    """
+    Students whose academic stats changed after their readiness score was last
+    computed, or who have stats but no score yet.
+    """
+    last_computed = func.coalesce(ReadinessScore.updated_at, ReadinessScore.created_at)
+    query = (
+        db.query(StudentAcademicStats.student_id)
+        .outerjoin(ReadinessScore, ReadinessScore.student_id == StudentAcademicStats.student_id)
+        .filter(StudentAcademicStats.subject_id == OVERALL_SUBJECT_ID)
+        .filter(or_(ReadinessScore.id.is_(None), StudentAcademicStats.updated_at > last_computed))
+    )
+    if student_ids is not None:
+        query = query.filter(StudentAcademicStats.student_id.in_(student_ids))
+    return [row.student_id for row in query.order_by(StudentAcademicStats.student_id).all()]
+
+def _recompute_batch(db: Session, student_ids: List[int], computed_at: datetime) -> int:
+    stats_rows = list(get_overall_stats(db, student_ids).values())
+    if not stats_rows:
+        return 0
+    averages = [stats_to_averages(row) for row in stats_rows]
+
+    results = calculate_readiness_scores_batch(
+        avg_marks=[a["avg_marks"] for a in averages],
+        attendance_pct=[a["attendance_pct"] for a in averages],
+        lab_score=[a["lab_avg"] for a in averages],
+        skill_coverage_pct=[DEFAULT_SKILL_COVERAGE_PCT] * len(averages),
+        project_count=[DEFAULT_PROJECT_COUNT] * len(averages)
+    )
+
+    existing = {
+        score.student_id: score
+        for score in db.query(ReadinessScore).filter(ReadinessScore.student_id.in_(student_ids)).all()
+    }
+    history = []
+    for row, score, risk in zip(stats_rows, results["readiness_scores"], results["risk_classifications"]):
+        readiness = existing.get(row.student_id)
+        if readiness is None:
+            readiness = ReadinessScore(student_id=row.student_id, missing_skills="[]", created_at=computed_at)
+            db.add(readiness)
+        # ORM updates (not bulk UPDATE) so cache invalidation hooks fire
+        readiness.score = score
+        readiness.risk_level = risk
+        readiness.updated_at = computed_at
+        history.append({"student_id": row.student_id, "score": score, "recorded_at": computed_at})
+
+    db.bulk_insert_mappings(ReadinessHistory, history)
+    db.commit()
+    return len(history)
+
+def recompute_readiness(
+    db: Session,
+    student_ids: Optional[List[int]] = None,
+    force: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    rebuild_stats: bool = False
+) -> Dict[str, Any]:
+    """
+    Recompute readiness scores from student_academic_stats for students with
+    new data (or every given/known student when force=True), batch by batch.
+    Each recomputed student gets a ReadinessHistory snapshot.
+
+    Students whose raw history never reached student_academic_stats get their
+    stats rows built first, so they are scored on their real history rather
+    than skipped. rebuild_stats=True rebuilds the stats of every given (or
+    every) student from raw history before a forced recompute; use it once to
+    repair stats rows that were started without the student's older history.
+
+    Scores are stamped with the run's start time, so data that arrives while
+    the run is in progress is picked up by the next run.
+    """
+    started_at = datetime.utcnow()
+    if rebuild_stats:
+        stats_rebuilt = rebuild_stats_in_batches(db, student_ids)
+        force = True
+    else:
+        stats_rebuilt = rebuild_stats_in_batches(db, find_students_missing_stats(db, student_ids))
+    if force:
+        query = db.query(StudentAcademicStats.student_id).filter(StudentAcademicStats.subject_id == OVERALL_SUBJECT_ID)
+        if student_ids is not None:
+            query = query.filter(StudentAcademicStats.student_id.in_(student_ids))
+        targets = [row.student_id for row in query.order_by(StudentAcademicStats.student_id).all()]
+    else:
+        targets = find_stale_students(db, student_ids)
+
+    recomputed = 0
+    batches = 0
+    for start in range(0, len(targets), batch_size):
+        recomputed += _recompute_batch(db, targets[start:start + batch_size], started_at)
+        batches += 1
+
+    return {
+        "started_at": started_at.isoformat(),
+        "finished_at": datetime.utcnow().isoformat(),
+        "candidates": len(targets),
+        "recomputed": recomputed,
+        "batches": batches,
+        "stats_rebuilt": stats_rebuilt
+    }
+
+_job_lock = threading.Lock()
+
+def run_recompute_job(student_ids: Optional[List[int]] = None, force: bool = False, rebuild_stats: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Entry point for background tasks and cron: runs recompute_readiness in its
+    own session. Returns None without doing anything if a run is already in
+    progress in this process.
+    """
+    if not _job_lock.acquire(blocking=False):
+        logger.info("Readiness recomputation already running; skipping")
+        return None
+    db = SessionLocal()
+    try:
+        summary = recompute_readiness(db, student_ids=student_ids, force=force, rebuild_stats=rebuild_stats)
+        logger.info("Readiness recomputation finished: %s", summary)
+        return summary
+    except Exception:
+        db.rollback()
+        logger.exception("Readiness recomputation failed")
+        raise
+    finally:
+        db.close()
+        _job_lock.release()
@@ -0,0 +1,159 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import DateTime, delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models import ReadinessHistory, Student
+
+BUCKETS = ("raw", "day", "week")
+DEFAULT_TREND_DAYS = 90
+MAX_RAW_POINTS = 5000
+
+def truncate_datetime(db: Session, bucket: str, column):
+    """SQL expression truncating column to the start of its day or ISO week (Monday)."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return func.date_trunc(bucket, column, type_=DateTime)
+    if dialect == "sqlite":
+        if bucket == "day":
+            return func.datetime(column, "start of day", type_=DateTime)
+        # Forward to Sunday (same day if already Sunday), then back to Monday
+        return func.datetime(column, "start of day", "weekday 0", "-6 days", type_=DateTime)
+    raise ValueError(f"Readiness trend buckets are not supported on {dialect}")
+
+def _python_bucket_start(value: datetime, bucket: str) -> datetime:
+    day = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if bucket == "week":
+        day -= timedelta(days=day.weekday())
+    return day
+
+def _sample_count():
+    return func.coalesce(ReadinessHistory.sample_count, 1)
+
+def _scoped(query, student_ids: Optional[List[int]], current_year: Optional[int]):
+    if student_ids is not None:
+        query = query.where(ReadinessHistory.student_id.in_(student_ids))
+    if current_year is not None:
+        query = query.join(Student, Student.id == ReadinessHistory.student_id).where(Student.current_year == current_year)
+    return query
+
+def get_readiness_trend(
+    db: Session,
+    student_ids: Optional[List[int]] = None,
+    current_year: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bucket: str = "day"
+) -> Dict[str, Any]:
+    """
+    Readiness series for one student or a cohort over [start, end).
+    Day/week buckets are aggregated in SQL (min/max/sample-weighted avg), so
+    the response size depends on the range, not on how much history exists.
+    Compacted rows count with their sample_count and keep their own min/max;
+    buckets finer than the stored granularity show one coarse point.
+
+    Raw points are only available for a single student, since a cohort's
+    snapshots do not form one series. They are capped at the newest
+    MAX_RAW_POINTS; `truncated` says older points in the range were left out.
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"bucket must be one of {', '.join(BUCKETS)}")
+    if bucket == "raw" and (current_year is not None or student_ids is None or len(set(student_ids)) != 1):
+        raise ValueError("bucket=raw is only available for a single student; use day or week for a cohort")
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=DEFAULT_TREND_DAYS)
+    if start >= end:
+        raise ValueError("start must be before end")
+
+    in_range = (ReadinessHistory.recorded_at >= start, ReadinessHistory.recorded_at < end)
+    if bucket == "raw":
+        query = _scoped(
+            select(
+                ReadinessHistory.recorded_at.label("ts"),
+                ReadinessHistory.score.label("avg"),
+                func.coalesce(ReadinessHistory.score_min, ReadinessHistory.score).label("min"),
+                func.coalesce(ReadinessHistory.score_max, ReadinessHistory.score).label("max"),
+                _sample_count().label("samples")
+            ).where(*in_range),
+            student_ids, current_year
+        ).order_by(ReadinessHistory.recorded_at.desc()).limit(MAX_RAW_POINTS + 1)
+    else:
+        bucket_start = truncate_datetime(db, bucket, ReadinessHistory.recorded_at).label("ts")
+        samples = _sample_count()
+        query = _scoped(
+            select(
+                bucket_start,
+                (func.sum(ReadinessHistory.score * samples) / func.sum(samples)).label("avg"),
+                func.min(func.coalesce(ReadinessHistory.score_min, ReadinessHistory.score)).label("min"),
+                func.max(func.coalesce(ReadinessHistory.score_max, ReadinessHistory.score)).label("max"),
+                func.sum(samples).label("samples")
+            ).where(*in_range),
+            student_ids, current_year
+        ).group_by(bucket_start).order_by(bucket_start)
+
+    rows = db.execute(query).all()
+    truncated = False
+    if bucket == "raw":
+        # Fetched newest first so the cap drops the oldest points
+        truncated = len(rows) > MAX_RAW_POINTS
+        rows = rows[:MAX_RAW_POINTS][::-1]
+    points = [
+        {
+            "t": row.ts.isoformat(),
+            "avg": round(row.avg, 2),
+            "min": round(row.min, 2),
+            "max": round(row.max, 2),
+            "samples": int(row.samples)
+        }
+        for row in rows
+    ]
+    return {
+        "bucket": bucket, "start": start.isoformat(), "end": end.isoformat(),
+        "points": points, "truncated": truncated
+    }
+
+def _compact(db: Session, sources: List[str], target: str, cutoff: datetime) -> Dict[str, int]:
+    """
+    Roll rows of the given (finer) granularities recorded before cutoff into
+    one target-granularity row per (student, bucket), then delete them.
+    Late rows landing in an already compacted bucket just add a second row
+    for it; trend queries weight both by sample_count.
+    """
+    eligible = (
+        ReadinessHistory.granularity.in_(sources),
+        ReadinessHistory.recorded_at < cutoff
+    )
+    bucket_start = truncate_datetime(db, target, ReadinessHistory.recorded_at)
+    samples = _sample_count()
+    rollup = select(
+        ReadinessHistory.student_id,
+        bucket_start,
+        func.sum(ReadinessHistory.score * samples) / func.sum(samples),
+        func.min(func.coalesce(ReadinessHistory.score_min, ReadinessHistory.score)),
+        func.max(func.coalesce(ReadinessHistory.score_max, ReadinessHistory.score)),
+        func.sum(samples),
+        literal(target)
+    ).where(*eligible).group_by(ReadinessHistory.student_id, bucket_start)
+
+    buckets = db.execute(insert(ReadinessHistory).from_select(
+        ["student_id", "recorded_at", "score", "score_min", "score_max", "sample_count", "granularity"],
+        rollup
+    )).rowcount
+    source_rows = db.execute(delete(ReadinessHistory).where(*eligible)).rowcount
+    db.commit()
+    return {"source_rows": source_rows, "buckets": buckets}
+
+def compact_readiness_history(db: Session, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Apply the retention policy: raw snapshots older than
+    READINESS_RAW_RETENTION_DAYS become daily rows, daily rows older than
+    READINESS_DAILY_RETENTION_DAYS become weekly rows. Cutoffs are aligned
+    to bucket boundaries so no bucket is split across granularities.
+    """
+    now = now or datetime.utcnow()
+    day_cutoff = _python_bucket_start(now - timedelta(days=settings.READINESS_RAW_RETENTION_DAYS), "day")
+    week_cutoff = _python_bucket_start(now - timedelta(days=settings.READINESS_DAILY_RETENTION_DAYS), "week")
+    return {
+        "day": _compact(db, ["raw"], "day", day_cutoff),
+        "week": _compact(db, ["raw", "day"], "week", week_cutoff)
+    }
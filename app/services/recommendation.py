@@ -1,23 +1,115 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Set
 from sqlalchemy.orm import Session
+from app.core.cache import DerivedCache, invalidate_on_commit
+from app.core.config import settings
 from app.models import Resource
 
+RESULTS_PER_SKILL = 2
+MIN_TRIGRAM_SIMILARITY = 0.3
+
+def _trigrams(text: str) -> Set[str]:
+    """pg_trgm-style trigrams: lowercase words padded with two leading and one trailing space."""
+    grams = set()
+    for word in text.lower().split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+def _similarity(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+class ResourceIndex(DerivedCache):
+    """
+    In-memory inverted trigram index over Resource.skill_name and title.
+
+    Built at startup. Committed ORM changes to resources and the
+    RESOURCE_INDEX_TTL_SECONDS expiry (for other processes) trigger a
+    background rebuild while the previous index keeps serving.
+    """
+
+    # Recommendations tolerate a briefly stale index; a rebuild is a full table scan
+    serve_stale_on_invalidate = True
+
+    def __init__(self, ttl_seconds: float):
+        super().__init__("resource_index", ttl_seconds)
+
+    def build(self, db: Session) -> Dict[str, Any]:
+        rows = db.query(Resource.id, Resource.skill_name, Resource.title, Resource.url, Resource.type).order_by(Resource.id).all()
+        entries = []
+        postings: Dict[str, Set[int]] = {}
+        for pos, row in enumerate(rows):
+            skill = (row.skill_name or "").lower()
+            title = (row.title or "").lower()
+            skill_grams = _trigrams(skill)
+            title_grams = _trigrams(title)
+            entries.append({
+                "id": row.id,
+                "skill": skill,
+                "title_lower": title,
+                "skill_grams": skill_grams,
+                "title_grams": title_grams,
+                "payload": {"title": row.title, "url": row.url, "type": row.type},
+            })
+            for gram in skill_grams | title_grams:
+                postings.setdefault(gram, set()).add(pos)
+        return {"entries": entries, "postings": postings}
+
+    def _rank(self, state: Dict[str, Any], skill: str) -> List[Dict[str, Any]]:
+        query = skill.lower().strip()
+        if not query:
+            return []
+        entries = state["entries"]
+        query_grams = _trigrams(query)
+
+        # Candidates share at least one trigram; very short queries ("C", "R")
+        # have no useful trigrams, so scan every entry instead
+        if len(query) < 3:
+            candidates = range(len(entries))
+        else:
+            candidates = set()
+            for gram in query_grams:
+                candidates |= state["postings"].get(gram, set())
+
+        scored = []
+        for pos in candidates:
+            entry = entries[pos]
+            if entry["skill"] == query:
+                score = 3.0
+            elif query in entry["skill"]:
+                score = 2.0 + _similarity(query_grams, entry["skill_grams"])
+            elif query in entry["title_lower"]:
+                score = 1.0 + _similarity(query_grams, entry["title_grams"])
+            else:
+                score = max(
+                    _similarity(query_grams, entry["skill_grams"]),
+                    _similarity(query_grams, entry["title_grams"]),
+                )
+                if score < MIN_TRIGRAM_SIMILARITY:
+                    continue
+            scored.append((-score, entry["id"], entry))
+        scored.sort(key=lambda item: (item[0], item[1]))
+        return [entry for _, _, entry in scored[:RESULTS_PER_SKILL]]
+
+    def lookup(self, db: Session, missing_skills: List[str]) -> List[Dict[str, Any]]:
+        """Ranked matches for every skill."""
+        state = self.get(db)
+        recommendations = []
+        for skill in missing_skills:
+            for entry in self._rank(state, skill):
+                recommendations.append({"skill": skill, **entry["payload"]})
+        return recommendations
+
+resource_index = ResourceIndex(settings.RESOURCE_INDEX_TTL_SECONDS)
+invalidate_on_commit(resource_index, Resource)
+
 def get_recommendations_for_skills(db: Session, missing_skills: List[str]) -> List[Dict[str, Any]]:
     """
-    Fetch recommended resources from the database for a list of missing skills.
+    Fetch recommended resources for a list of missing skills, ranked by the
+    in-memory index. Only a process that has never built the index pays for
+    the build, once; concurrent callers wait for it instead of building too.
     """
     if not missing_skills:
         return []
-    
-    recommendations = []
-    for skill in missing_skills:
-        resources = db.query(Resource).filter(Resource.skill_name.ilike(f"%{skill}%")).limit(2).all()
-        for res in resources:
-            recommendations.append({
-                "skill": skill,
-                "title": res.title,
-                "url": res.url,
-                "type": res.type
-            })
-            
-    return recommendations
+    return resource_index.lookup(db, missing_skills)
@@ -1,5 +1,18 @@
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import (
+    IndustryRole, PlacementPrediction, ReadinessScore, Student, StudentAcademicStats,
+    Subject, SubjectIndustryMapping
+)
+from app.services.academic_stats import OVERALL_SUBJECT_ID
+
+TOP_ROLE_LIMIT = 5
+# (department, current_year, date) -> report
+report_cache = TTLCache(settings.REPORT_CACHE_TTL_SECONDS, settings.REPORT_CACHE_MAX_SIZE)
 
 def generate_accreditation_report(
     department_name: str,
@@ -43,3 +56,101 @@ def generate_accreditation_report(
     }
     
     return report
+
+def _ratio(numerator, denominator, scale: float = 1.0) -> float:
+    return round(numerator / denominator * scale, 2) if denominator else 0.0
+
+def _performance_band(avg_marks: float) -> str:
+    return "Strong" if avg_marks >= 75 else "Average" if avg_marks >= 50 else "Needs Attention"
+
+def compute_report_aggregates(db: Session, current_year: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Accreditation report inputs computed in the database: a handful of
+    aggregate queries over student_academic_stats, readiness scores,
+    placement predictions and subject_industry_mapping. Only the aggregated
+    rows leave the database. Scoped to one year when current_year is given.
+    """
+    cohort = select(Student.id)
+    if current_year is not None:
+        cohort = cohort.where(Student.current_year == current_year)
+
+    total_students = db.execute(select(func.count()).select_from(cohort.subquery())).scalar() or 0
+
+    present, total = db.execute(
+        select(func.sum(StudentAcademicStats.attendance_present), func.sum(StudentAcademicStats.attendance_total))
+        .where(StudentAcademicStats.subject_id == OVERALL_SUBJECT_ID, StudentAcademicStats.student_id.in_(cohort))
+    ).one()
+    avg_readiness = db.execute(
+        select(func.avg(ReadinessScore.score)).where(ReadinessScore.student_id.in_(cohort))
+    ).scalar()
+    avg_placement = db.execute(
+        select(func.avg(PlacementPrediction.probability)).where(PlacementPrediction.student_id.in_(cohort))
+    ).scalar()
+
+    # Per-subject heatmap: one GROUP BY over the per-subject stats rows
+    heatmap_rows = db.execute(
+        select(
+            Subject.code,
+            Subject.name,
+            func.count(StudentAcademicStats.student_id).label("students"),
+            func.sum(StudentAcademicStats.attendance_present).label("present"),
+            func.sum(StudentAcademicStats.attendance_total).label("total"),
+            func.sum(StudentAcademicStats.marks_sum).label("marks_sum"),
+            func.sum(StudentAcademicStats.marks_count).label("marks_count"),
+            func.sum(StudentAcademicStats.lab_sum).label("lab_sum"),
+            func.sum(StudentAcademicStats.lab_count).label("lab_count")
+        )
+        .join(Subject, Subject.id == StudentAcademicStats.subject_id)
+        .where(StudentAcademicStats.subject_id != OVERALL_SUBJECT_ID, StudentAcademicStats.student_id.in_(cohort))
+        .group_by(Subject.id, Subject.code, Subject.name)
+        .order_by(Subject.code)
+    ).all()
+    heatmap = {}
+    for row in heatmap_rows:
+        avg_marks = _ratio(row.marks_sum or 0, row.marks_count)
+        heatmap[row.code] = {
+            "subject": row.name,
+            "students": row.students,
+            "attendance_pct": _ratio(row.present or 0, row.total, 100),
+            "avg_marks": avg_marks,
+            "lab_avg": _ratio(row.lab_sum or 0, row.lab_count),
+            "performance_band": _performance_band(avg_marks)
+        }
+
+    # Roles ranked by how many cohort students take a subject mapped to them
+    enrolled = (
+        select(StudentAcademicStats.student_id, StudentAcademicStats.subject_id)
+        .where(StudentAcademicStats.subject_id != OVERALL_SUBJECT_ID, StudentAcademicStats.student_id.in_(cohort))
+        .subquery()
+    )
+    reached = func.count(func.distinct(enrolled.c.student_id))
+    mapped_subjects = func.count(func.distinct(SubjectIndustryMapping.subject_id))
+    top_roles = db.execute(
+        select(IndustryRole.title)
+        .join(SubjectIndustryMapping, SubjectIndustryMapping.role_id == IndustryRole.id)
+        .outerjoin(enrolled, enrolled.c.subject_id == SubjectIndustryMapping.subject_id)
+        .group_by(IndustryRole.id, IndustryRole.title)
+        .order_by(reached.desc(), mapped_subjects.desc(), IndustryRole.title)
+        .limit(TOP_ROLE_LIMIT)
+    ).scalars().all()
+
+    return {
+        "total_students": total_students,
+        "avg_attendance": _ratio(present or 0, total, 100),
+        "avg_skill_readiness": round(avg_readiness or 0, 2),
+        "placement_probability_avg": round(avg_placement or 0, 2),
+        "faculty_heatmap_summary": heatmap,
+        "top_industry_roles": list(top_roles)
+    }
+
+def generate_department_report(db: Session, department_name: str, current_year: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Accreditation report with server-computed aggregates, cached per
+    department, cohort and report date.
+    """
+    key = (department_name, current_year, datetime.utcnow().strftime("%Y-%m-%d"))
+    report = report_cache.get(key)
+    if report is None:
+        report = generate_accreditation_report(department_name=department_name, **compute_report_aggregates(db, current_year))
+        report_cache.set(key, report)
+    return report
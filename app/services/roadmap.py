@@ -1,17 +1,15 @@
-from typing import List, Dict, Any
+import copy
+import json
+from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
+from app.core.cache import DerivedCache, invalidate_on_commit
+from app.core.config import settings
 from app.models import Skill, Student
 
-def get_career_roadmap(db: Session, student_id: int) -> Dict[str, Any]:
-    """
-    Generate a 4-year career roadmap based on skill progression.
-    """
-    student = db.query(Student).filter(Student.id == student_id).first()
-    if not student:
-        return {"error": "Student not found"}
+ACADEMIC_YEARS = (1, 2, 3, 4)
 
-    all_skills = db.query(Skill).order_by(Skill.academic_year).all()
-    
+def _build_roadmap(skills: List[Dict[str, Any]], current_year: int) -> Dict[str, Any]:
+    """Lay the skill catalog out over the four years relative to current_year."""
     roadmap = {
         "1": [], # 1st Year
         "2": [], # 2nd Year
@@ -19,18 +17,18 @@ def get_career_roadmap(db: Session, student_id: int) -> Dict[str, Any]:
         "4": []  # Final Year
     }
     
-    for skill in all_skills:
-        year_str = str(skill.academic_year)
+    for skill in skills:
+        year_str = str(skill["academic_year"])
         if year_str in roadmap:
             roadmap[year_str].append({
-                "id": skill.id,
-                "name": skill.name,
-                "description": skill.description,
-                "status": "Target" if skill.academic_year > student.current_year else "In Progress" if skill.academic_year == student.current_year else "Completed"
+                "id": skill["id"],
+                "name": skill["name"],
+                "description": skill["description"],
+                "status": "Target" if skill["academic_year"] > current_year else "In Progress" if skill["academic_year"] == current_year else "Completed"
             })
             
     return {
-        "current_year": student.current_year,
+        "current_year": current_year,
         "roadmap": roadmap,
         "status_summary": {
             "completed": sum(1 for y in roadmap for s in roadmap[y] if s["status"] == "Completed"),
@@ -38,3 +36,65 @@ def get_career_roadmap(db: Session, student_id: int) -> Dict[str, Any]:
             "active": sum(1 for y in roadmap for s in roadmap[y] if s["status"] == "In Progress")
         }
     }
+
+class RoadmapCache(DerivedCache):
+    """
+    The roadmap only depends on current_year and the skill catalog, so the
+    four variants are built once and kept together with their JSON bytes.
+    Committed ORM changes to skills trigger a background rebuild; changes
+    made by other processes (e.g. seed_roadmap.py) are picked up after
+    ROADMAP_CACHE_TTL_SECONDS. Cached templates are shared: callers get
+    copies or the immutable JSON bytes.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        super().__init__("roadmap_cache", ttl_seconds)
+
+    def build(self, db: Session) -> Dict[str, Any]:
+        rows = db.query(Skill).order_by(Skill.academic_year).all()
+        skills = [
+            {"id": s.id, "name": s.name, "description": s.description, "academic_year": s.academic_year}
+            for s in rows
+        ]
+        templates = {}
+        for year in ACADEMIC_YEARS:
+            data = _build_roadmap(skills, year)
+            templates[year] = {"data": data, "body": json.dumps(data).encode("utf-8")}
+        return {"skills": skills, "templates": templates}
+
+    def template(self, db: Session, current_year: int) -> Dict[str, Any]:
+        """Template for current_year as {"data": dict, "body": bytes}; do not mutate "data"."""
+        state = self.get(db)
+        template = state["templates"].get(current_year)
+        if template is None:
+            # Years outside 1-4 are rare; build them on demand without caching
+            data = _build_roadmap(state["skills"], current_year)
+            template = {"data": data, "body": json.dumps(data).encode("utf-8")}
+        return template
+
+roadmap_cache = RoadmapCache(settings.ROADMAP_CACHE_TTL_SECONDS)
+
+invalidate_on_commit(roadmap_cache, Skill)
+
+def _get_template(db: Session, student_id: int) -> Optional[Dict[str, Any]]:
+    row = db.query(Student.current_year).filter(Student.id == student_id).first()
+    if row is None:
+        return None
+    return roadmap_cache.template(db, row.current_year)
+
+def get_career_roadmap(db: Session, student_id: int) -> Dict[str, Any]:
+    """
+    Generate a 4-year career roadmap based on skill progression.
+    """
+    template = _get_template(db, student_id)
+    if template is None:
+        return {"error": "Student not found"}
+    # The template is shared by every caller; hand out a copy
+    return copy.deepcopy(template["data"])
+
+def get_career_roadmap_json(db: Session, student_id: int) -> Optional[bytes]:
+    """Pre-serialized roadmap for the student, or None if the student does not exist."""
+    template = _get_template(db, student_id)
+    if template is None:
+        return None
+    return template["body"]
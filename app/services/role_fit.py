@@ -0,0 +1,141 @@
+from typing import List, Dict, Any, Optional
+from sqlalchemy.orm import Session
+from app.core.cache import DerivedCache, invalidate_on_commit
+from app.core.config import settings
+from app.models import IndustryRole, RoleSkillMapping, Skill, Student
+
+DEFAULT_ROLE_LIMIT = 5
+
+def _bits(mask: int) -> List[int]:
+    """Positions of the set bits, lowest first."""
+    positions = []
+    while mask:
+        low = mask & -mask
+        positions.append(low.bit_length() - 1)
+        mask ^= low
+    return positions
+
+class RoleSkillIndex(DerivedCache):
+    """
+    Role -> required skills as bitsets: bit i stands for the i-th skill in id
+    order, and each role's requirements are one Python int. Fitting a student
+    against every role is an AND and a popcount per role, with no queries.
+
+    Built at startup. Committed ORM changes to skills, roles or their mapping
+    and catalog upserts invalidate it; other processes are picked up after
+    ROLE_FIT_INDEX_TTL_SECONDS.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        super().__init__("role_skill_index", ttl_seconds)
+
+    def build(self, db: Session) -> Dict[str, Any]:
+        skills = db.query(Skill.id, Skill.name, Skill.academic_year).order_by(Skill.id).all()
+        roles = db.query(IndustryRole.id, IndustryRole.title, IndustryRole.average_salary).order_by(IndustryRole.id).all()
+        mappings = db.query(RoleSkillMapping.role_id, RoleSkillMapping.skill_id).all()
+
+        bit_of = {skill.id: bit for bit, skill in enumerate(skills)}
+        masks = {role.id: 0 for role in roles}
+        for role_id, skill_id in mappings:
+            if role_id in masks and skill_id in bit_of:
+                masks[role_id] |= 1 << bit_of[skill_id]
+        # Roles without mapped skills cannot be fitted and are left out
+        role_entries = [
+            {
+                "role_id": role.id, "title": role.title, "average_salary": role.average_salary,
+                "mask": masks[role.id], "required": masks[role.id].bit_count()
+            }
+            for role in roles if masks[role.id]
+        ]
+        # Skills a student has completed by their current year, as on the roadmap
+        completed_by_year: Dict[int, int] = {}
+        for year in range(1, 6):
+            completed_by_year[year] = sum(
+                1 << bit for bit, skill in enumerate(skills)
+                if skill.academic_year is not None and skill.academic_year < year
+            )
+        return {
+            "names": [skill.name for skill in skills],
+            "bit_of_name": {skill.name.lower(): bit for bit, skill in enumerate(skills) if skill.name},
+            "roles": role_entries,
+            "completed_by_year": completed_by_year,
+        }
+
+    def skill_mask(self, db: Session, skill_names: List[str]) -> Dict[str, Any]:
+        """Encode skill names (case-insensitive) as a bitset; unknown names are returned separately."""
+        state = self.get(db)
+        mask, unknown = 0, []
+        for name in skill_names:
+            bit = state["bit_of_name"].get((name or "").strip().lower())
+            if bit is None:
+                unknown.append(name)
+            else:
+                mask |= 1 << bit
+        return {"mask": mask, "unknown": unknown}
+
+    def completed_mask(self, db: Session, current_year: int) -> int:
+        state = self.get(db)
+        year = min(max(current_year or 1, 1), max(state["completed_by_year"]))
+        return state["completed_by_year"][year]
+
+    def rank(self, db: Session, acquired: int, limit: Optional[int] = DEFAULT_ROLE_LIMIT, role_title: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Coverage and missing skills of the `acquired` bitset against every
+        role (or only `role_title`), best fit first: highest coverage, then
+        most matched skills, then title.
+        """
+        state = self.get(db)
+        names = state["names"]
+        fits = []
+        for role in state["roles"]:
+            if role_title is not None and role["title"].lower() != role_title.lower():
+                continue
+            matched = (acquired & role["mask"]).bit_count()
+            fits.append((role, matched, matched / role["required"]))
+        fits.sort(key=lambda fit: (-fit[2], -fit[1], fit[0]["title"]))
+        if limit is not None:
+            fits = fits[:limit]
+
+        return [
+            {
+                "role_id": role["role_id"],
+                "title": role["title"],
+                "average_salary": role["average_salary"],
+                "coverage_pct": round(coverage * 100, 2),
+                "matched_count": matched,
+                "required_count": role["required"],
+                "missing_skills": [names[bit] for bit in _bits(role["mask"] & ~acquired)],
+            }
+            for role, matched, coverage in fits
+        ]
+
+role_skill_index = RoleSkillIndex(settings.ROLE_FIT_INDEX_TTL_SECONDS)
+
+invalidate_on_commit(role_skill_index, Skill, IndustryRole, RoleSkillMapping)
+
+def get_role_fit(
+    db: Session,
+    acquired_skills: Optional[List[str]] = None,
+    student_id: Optional[int] = None,
+    limit: Optional[int] = DEFAULT_ROLE_LIMIT,
+    role_title: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Rank industry roles by how much of their required skill set is covered.
+    Acquired skills are the given names, or for a student the skills their
+    roadmap marks completed (academic_year below their current year).
+    """
+    if acquired_skills is not None:
+        encoded = role_skill_index.skill_mask(db, acquired_skills)
+        acquired, unknown = encoded["mask"], encoded["unknown"]
+    else:
+        row = db.query(Student.current_year).filter(Student.id == student_id).first()
+        if row is None:
+            return {"error": "Student not found"}
+        acquired, unknown = role_skill_index.completed_mask(db, row.current_year), []
+
+    return {
+        "acquired_count": acquired.bit_count(),
+        "unknown_skills": unknown,
+        "roles": role_skill_index.rank(db, acquired, limit=limit, role_title=role_title)
+    }
@@ -1,5 +1,10 @@
 from typing import List, Dict, Any
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to the scalar path
+    np = None
+
 def calculate_readiness_score(
     avg_marks: float,
     attendance_pct: float,
@@ -48,3 +53,57 @@ def calculate_readiness_score(
         "risk_classification": risk_classification,
         "missing_skills": missing_skills or []
     }
+
+def calculate_readiness_scores_batch(
+    avg_marks: List[float],
+    attendance_pct: List[float],
+    lab_score: List[float],
+    skill_coverage_pct: List[float],
+    project_count: List[int]
+) -> Dict[str, List[Any]]:
+    """
+    Column-oriented variant of calculate_readiness_score for whole classes.
+
+    Inputs are parallel lists (one entry per student) and the outputs keep the
+    same order. Clamping, weighting and risk classification happen in a single
+    array pass; rounding goes through Python's round() so every score matches
+    the scalar function exactly.
+    """
+    columns = [avg_marks, attendance_pct, lab_score, skill_coverage_pct, project_count]
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("All input columns must have the same length")
+
+    if np is None:
+        results = [
+            calculate_readiness_score(m, a, l, s, p)
+            for m, a, l, s, p in zip(*columns)
+        ]
+        return {
+            "readiness_scores": [r["readiness_score"] for r in results],
+            "risk_classifications": [r["risk_classification"] for r in results]
+        }
+
+    # fmin/fmax mirror max(0, min(100, x)), including how it treats NaN
+    def clamp(values):
+        return np.fmax(0, np.fmin(100, np.asarray(values, dtype=np.float64)))
+
+    project_score = np.fmin(100, np.asarray(project_count, dtype=np.int64) * 20.0)
+
+    # Same weights and summation order as the scalar function
+    readiness_scores = (
+        (clamp(avg_marks) * 0.30) +
+        (clamp(attendance_pct) * 0.20) +
+        (clamp(lab_score) * 0.20) +
+        (clamp(skill_coverage_pct) * 0.20) +
+        (project_score * 0.10)
+    )
+
+    risk_classifications = np.where(
+        readiness_scores >= 75, "Low",
+        np.where(readiness_scores >= 50, "Medium", "High")
+    )
+
+    return {
+        "readiness_scores": [round(score, 2) for score in readiness_scores.tolist()],
+        "risk_classifications": risk_classifications.tolist()
+    }
@@ -0,0 +1,67 @@
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+import anyio
+from fastapi import UploadFile
+
+CHUNK_SIZE = 1024 * 1024 # 1 MiB
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the configured size limit."""
+
+@dataclass
+class StoredFile:
+    path: str
+    sha256: str
+    size: int
+    deduplicated: bool
+
+def blob_path(upload_dir: str, digest: str) -> str:
+    """Content-addressed location: <upload_dir>/blobs/ab/abcdef..."""
+    return os.path.join(upload_dir, "blobs", digest[:2], digest)
+
+async def store_upload(file: UploadFile, upload_dir: str, max_bytes: int) -> StoredFile:
+    """
+    Stream an upload to disk in chunks without blocking the event loop,
+    hashing it on the way. Identical content is stored only once: if the
+    blob already exists the new copy is discarded and the existing path
+    is returned.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLarge()
+
+    tmp_dir = os.path.join(upload_dir, "tmp")
+    await anyio.Path(tmp_dir).mkdir(parents=True, exist_ok=True)
+    tmp_path = os.path.join(tmp_dir, uuid.uuid4().hex)
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with await anyio.open_file(tmp_path, "wb") as out:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge()
+                digest.update(chunk)
+                await out.write(chunk)
+
+        sha256 = digest.hexdigest()
+        final_path = blob_path(upload_dir, sha256)
+        if await anyio.Path(final_path).exists():
+            await anyio.Path(tmp_path).unlink()
+            return StoredFile(final_path, sha256, size, deduplicated=True)
+
+        await anyio.Path(final_path).parent.mkdir(parents=True, exist_ok=True)
+        # Atomic on the same filesystem; concurrent identical uploads end up with one blob
+        await anyio.to_thread.run_sync(os.replace, tmp_path, final_path)
+        return StoredFile(final_path, sha256, size, deduplicated=False)
+    except BaseException:
+        try:
+            await anyio.Path(tmp_path).unlink()
+        except FileNotFoundError:
+            pass
+        raise
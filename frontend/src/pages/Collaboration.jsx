@@ -14,6 +14,8 @@ const Collaboration = () => {
     const navigate = useNavigate();
     const [activeTab, setActiveTab] = useState('materials'); // 'materials' or 'notices'
     const [materials, setMaterials] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [notices, setNotices] = useState([]);
     const [subjects, setSubjects] = useState([]);
     const [loading, setLoading] = useState(true);
@@ -39,6 +41,7 @@ const Collaboration = () => {
                     client.get('/students/subjects')
                 ]);
                 setMaterials(matRes.data);
+                setNextCursor(matRes.headers['x-next-cursor'] || null);
                 setNotices(noticeRes.data);
                 setSubjects(subRes.data);
             } catch (err) {
@@ -50,6 +53,21 @@ const Collaboration = () => {
         fetchData();
     }, []);
 
+    // The listing is paged; follow X-Next-Cursor to fetch older materials
+    const loadMoreMaterials = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const res = await client.get('/collaboration/materials', { params: { cursor: nextCursor } });
+            setMaterials(prev => [...prev, ...res.data]);
+            setNextCursor(res.headers['x-next-cursor'] || null);
+        } catch (err) {
+            console.error('Error fetching materials:', err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const handleUpload = async (e) => {
         e.preventDefault();
         if (!selectedFile) return;
@@ -219,6 +237,18 @@ const Collaboration = () => {
                                 </div>
                             ))}
                         </div>
+
+                        {nextCursor && (
+                            <div className="flex justify-center">
+                                <button
+                                    onClick={loadMoreMaterials}
+                                    disabled={loadingMore}
+                                    className="px-6 py-3 bg-white text-slate-600 font-bold rounded-2xl border border-slate-200 hover:border-primary-300 transition-all flex items-center gap-2 active:scale-95"
+                                >
+                                    {loadingMore ? <Loader2 className="animate-spin w-5 h-5" /> : 'Load more'}
+                                </button>
+                            </div>
+                        )}
                     </div>
                 ) : (
                     <div className="max-w-4xl space-y-6 animate-slide-up">
@@ -1,5 +1,7 @@
 -- schema.sql
 -- Paste this into the Supabase SQL Editor
+-- Creates the full schema on a fresh database. Databases created from an
+-- earlier version of this file are brought up to date with MIGRATION.sql.
 
 -- Create students table
 CREATE TABLE IF NOT EXISTS students (
@@ -8,8 +10,10 @@ CREATE TABLE IF NOT EXISTS students (
     roll_number VARCHAR(100) UNIQUE NOT NULL,
     email VARCHAR(255) UNIQUE NOT NULL,
     hashed_password VARCHAR(255) NOT NULL,
+    current_year INTEGER DEFAULT 1,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
+CREATE INDEX IF NOT EXISTS idx_students_name ON students(name);
 
 -- Create subjects table
 CREATE TABLE IF NOT EXISTS subjects (
@@ -18,6 +22,7 @@ CREATE TABLE IF NOT EXISTS subjects (
     code VARCHAR(50) UNIQUE NOT NULL,
     credits INTEGER NOT NULL
 );
+CREATE INDEX IF NOT EXISTS idx_subjects_name ON subjects(name);
 
 -- Create attendance_records table
 CREATE TABLE IF NOT EXISTS attendance_records (
@@ -27,7 +32,7 @@ CREATE TABLE IF NOT EXISTS attendance_records (
     date TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     status BOOLEAN NOT NULL -- true for present, false for absent
 );
-CREATE INDEX idx_attendance_student ON attendance_records(student_id);
+CREATE INDEX IF NOT EXISTS idx_attendance_student ON attendance_records(student_id);
 
 -- Create marks table
 CREATE TABLE IF NOT EXISTS marks (
@@ -38,7 +43,7 @@ CREATE TABLE IF NOT EXISTS marks (
     score DECIMAL(5, 2) NOT NULL,
     max_score DECIMAL(5, 2) NOT NULL
 );
-CREATE INDEX idx_marks_student ON marks(student_id);
+CREATE INDEX IF NOT EXISTS idx_marks_student ON marks(student_id);
 
 -- Create lab_performance table
 CREATE TABLE IF NOT EXISTS lab_performance (
@@ -48,12 +53,13 @@ CREATE TABLE IF NOT EXISTS lab_performance (
     score DECIMAL(5, 2) NOT NULL,
     max_score DECIMAL(5, 2) NOT NULL
 );
-CREATE INDEX idx_lab_student ON lab_performance(student_id);
+CREATE INDEX IF NOT EXISTS idx_lab_student ON lab_performance(student_id);
 
 -- Create skills table
 CREATE TABLE IF NOT EXISTS skills (
     id SERIAL PRIMARY KEY,
     name VARCHAR(255) UNIQUE NOT NULL,
+    academic_year INTEGER DEFAULT 1,
     description TEXT
 );
 
@@ -87,7 +93,8 @@ CREATE TABLE IF NOT EXISTS readiness_scores (
     score DECIMAL(5, 2) NOT NULL,
     risk_level VARCHAR(50) NOT NULL,
     missing_skills JSONB,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP
 );
 
 -- Create placement_predictions table
@@ -99,3 +106,99 @@ CREATE TABLE IF NOT EXISTS placement_predictions (
     suggestions TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
+
+-- Create readiness_history table (raw samples, compacted to day/week rows)
+CREATE TABLE IF NOT EXISTS readiness_history (
+    id SERIAL PRIMARY KEY,
+    student_id INTEGER REFERENCES students(id) ON DELETE CASCADE,
+    score FLOAT,
+    recorded_at TIMESTAMP DEFAULT (NOW() AT TIME ZONE 'utc'),
+    granularity VARCHAR NOT NULL DEFAULT 'raw',
+    score_min FLOAT,
+    score_max FLOAT,
+    sample_count INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS ix_readiness_history_student_recorded ON readiness_history(student_id, recorded_at);
+
+-- Create badges table
+CREATE TABLE IF NOT EXISTS badges (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) UNIQUE NOT NULL,
+    description TEXT,
+    icon_url TEXT
+);
+
+-- Create student_badges table
+CREATE TABLE IF NOT EXISTS student_badges (
+    id SERIAL PRIMARY KEY,
+    student_id INTEGER REFERENCES students(id) ON DELETE CASCADE,
+    badge_id INTEGER REFERENCES badges(id) ON DELETE CASCADE,
+    awarded_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Create resources table
+CREATE TABLE IF NOT EXISTS resources (
+    id SERIAL PRIMARY KEY,
+    skill_name VARCHAR(255),
+    title VARCHAR(255),
+    url TEXT,
+    type VARCHAR(50)
+);
+CREATE INDEX IF NOT EXISTS idx_resources_skill_name ON resources(skill_name);
+
+-- Create shared_materials table
+CREATE TABLE IF NOT EXISTS shared_materials (
+    id SERIAL PRIMARY KEY,
+    title VARCHAR(255) NOT NULL,
+    description TEXT,
+    category VARCHAR(50),
+    file_path TEXT NOT NULL,
+    file_name TEXT,
+    content_hash VARCHAR(64),
+    file_size BIGINT,
+    subject_id INTEGER REFERENCES subjects(id),
+    uploader_id INTEGER REFERENCES students(id),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT (NOW() AT TIME ZONE 'utc')
+);
+CREATE INDEX IF NOT EXISTS idx_shared_materials_title ON shared_materials(title);
+CREATE INDEX IF NOT EXISTS ix_shared_materials_created_at_id ON shared_materials(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_shared_materials_content_hash ON shared_materials(content_hash);
+CREATE INDEX IF NOT EXISTS ix_shared_materials_updated_at ON shared_materials(updated_at);
+
+-- Create campus_notifications table
+CREATE TABLE IF NOT EXISTS campus_notifications (
+    id SERIAL PRIMARY KEY,
+    title VARCHAR(255) NOT NULL,
+    content TEXT NOT NULL,
+    priority VARCHAR(20) DEFAULT 'Normal',
+    category VARCHAR(50),
+    expires_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_campus_notifications_title ON campus_notifications(title);
+CREATE INDEX IF NOT EXISTS ix_campus_notifications_expires_at ON campus_notifications(expires_at);
+
+-- Create student_academic_stats table (subject_id = 0 holds overall totals)
+CREATE TABLE IF NOT EXISTS student_academic_stats (
+    student_id INTEGER REFERENCES students(id) ON DELETE CASCADE,
+    subject_id INTEGER NOT NULL DEFAULT 0,
+    attendance_present INTEGER NOT NULL DEFAULT 0,
+    attendance_total INTEGER NOT NULL DEFAULT 0,
+    marks_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    marks_count INTEGER NOT NULL DEFAULT 0,
+    lab_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    lab_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (student_id, subject_id)
+);
+CREATE INDEX IF NOT EXISTS ix_student_academic_stats_updated_at ON student_academic_stats(updated_at);
+
+-- Create revoked_tokens table (JWT ids revoked before expiry)
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti VARCHAR(64) PRIMARY KEY,
+    expires_at TIMESTAMP NOT NULL,
+    revoked_at TIMESTAMP DEFAULT (NOW() AT TIME ZONE 'utc')
+);
+CREATE INDEX IF NOT EXISTS idx_revoked_tokens_revoked_at ON revoked_tokens(revoked_at);
+CREATE INDEX IF NOT EXISTS idx_revoked_tokens_expires_at ON revoked_tokens(expires_at);